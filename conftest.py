@@ -0,0 +1,9 @@
+"""Shared pytest setup: put the repo root and orchestrator/ on sys.path once for every test module."""
+
+import sys
+from pathlib import Path
+
+_HERE = Path(__file__).parent
+for _path in (str(_HERE), str(_HERE / "orchestrator")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
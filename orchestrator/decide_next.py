@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
 import json
 import os
 import re
@@ -14,17 +16,48 @@ except Exception:
     from debug import get_logger  # type: ignore
 
 try:
-    from .envelope_validator import validate_envelope  # type: ignore
+    from .envelope_validator import Envelope, validate_envelope, validate_envelope_fast  # type: ignore
 except Exception:
     import sys as _sys
     from pathlib import Path as _Path
     _sys.path.append(str(_Path(__file__).resolve().parent))
-    from envelope_validator import validate_envelope  # type: ignore
+    from envelope_validator import Envelope, validate_envelope, validate_envelope_fast  # type: ignore
+
+try:
+    from .loop_thread import run_sync  # type: ignore
+except Exception:
+    import sys as _sys
+    from pathlib import Path as _Path
+    _sys.path.append(str(_Path(__file__).resolve().parent))
+    from loop_thread import run_sync  # type: ignore
 
 
 DEFAULT_MODEL = os.getenv("DECIDE_MODEL", "gpt-5")
 logger = get_logger("decide_next")
 
+_JSON_DECODER = json.JSONDecoder()
+
+# Async SDK clients are created once and live on the shared background loop (see loop_thread)
+_ASYNC_CLIENTS: Dict[str, Any] = {}
+
+_REPAIR_PROMPT = (
+    "The previous JSON was invalid against the schema due to:\n{errors}"
+    "\nRe-emit a corrected JSON envelope only. Follow the schema exactly."
+)
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+
+def _first_json_object(text: str) -> Dict[str, Any] | None:
+    """Decode the first complete JSON object in text, ignoring whatever follows it."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        obj, _ = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
 
 def _clean_and_parse_json(text: str) -> Tuple[bool, Dict[str, Any] | str]:
     """
@@ -37,14 +70,12 @@ def _clean_and_parse_json(text: str) -> Tuple[bool, Dict[str, Any] | str]:
     original_text = text.strip()
     logger.debug("Attempting to parse JSON from %d chars", len(original_text))
 
-    # Strategy 1: Try parsing as-is
-    try:
-        obj = json.loads(original_text)
-        if isinstance(obj, dict):
-            logger.debug("JSON parsed successfully on first attempt")
-            return True, obj
-    except json.JSONDecodeError as e:
-        logger.debug("Direct JSON parse failed: %s", e)
+    # Strategy 1: Decode the first complete object and stop there (trailing prose is ignored)
+    obj = _first_json_object(original_text)
+    if obj is not None:
+        logger.debug("JSON parsed successfully on first attempt")
+        return True, obj
+    logger.debug("Direct JSON parse failed")
 
     # Strategy 2: Extract JSON from markdown code blocks
     code_block_patterns = [
@@ -329,8 +360,8 @@ def _auto_repair_envelope(envelope: Dict[str, Any]) -> Dict[str, Any]:
 def _try_import_openai():
     try:
         # New SDK
-        from openai import OpenAI  # type: ignore
-        return ("new", OpenAI)
+        from openai import AsyncOpenAI  # type: ignore
+        return ("new", AsyncOpenAI)
     except Exception:
         pass
     try:
@@ -343,12 +374,19 @@ def _try_import_openai():
 
 def _try_import_anthropic():
     try:
-        from anthropic import Anthropic  # type: ignore
-        return ("anthropic", Anthropic)
+        from anthropic import AsyncAnthropic  # type: ignore
+        return ("anthropic", AsyncAnthropic)
     except Exception:
         return (None, None)
 
 
+def _async_client(provider: str, client_ctor: Any) -> Any:
+    client = _ASYNC_CLIENTS.get(provider)
+    if client is None:
+        client = _ASYNC_CLIENTS[provider] = client_ctor()
+    return client
+
+
 def _summarize_tools(ws_tools: List[Dict[str, Any]]) -> str:
     lines: List[str] = []
 
@@ -392,7 +430,8 @@ def _format_conversation_history(history: List[Any]) -> str:
     lines.append("-" * 40)
 
     # Show last 40 events (adjustable)
-    recent_history = history[-40:] if len(history) > 40 else history
+    # islice rather than slicing so a bounded deque history works too
+    recent_history = itertools.islice(history, len(history) - 40, None) if len(history) > 40 else history
 
     for i, event in enumerate(recent_history, 1):
         if isinstance(event, dict):
@@ -425,6 +464,60 @@ def _format_conversation_history(history: List[Any]) -> str:
     return "\n".join(lines)
 
 
+# The system prompt only depends on static schema/policy text, so it is built once
+# at import instead of on every attempt and repair.
+_SYSTEM_PROMPT = (
+    "You are an autonomous agent. ALWAYS output exactly one JSON envelope, no prose.\n"
+    "Schema:\n"
+    "{\n"
+    "  envelope_id: string,\n"
+    "  timestamp: ISO-8601 string,\n"
+    "  state: one of [message, tool, plan, finish, ask_human, wait, handoff, reflect, error],\n"
+    "  brief_rationale: string,\n"
+    "  conversation?: {utterance, dialogue_act, target},\n"
+    "  tool?: string,\n"
+    "  arguments?: object,\n"
+    "  server_label?: string,\n"
+    "  plan?: {root_task, steps, execution_mode, confidence, revision},\n"
+    "  wait?: {event_type, timeout},\n"
+    "  finish?: {summary, artifacts},\n"
+    "  handoff?: {to_agent, message, context},\n"
+    "  reflect?: {analysis, next_action},\n"
+    "  error?: {error_type, error_message, suggested_repair},\n"
+    "  meta?: {budget:{...}, risk:{level,reason}, goal_update?:{...}, todo_update?:{...}, continue?: boolean}\n"
+    "}\n"
+    "Rules:\n"
+    "- Respond with ONLY this JSON object.\n"
+    "- For conversation, use state=message + conversation. dialogue_act can be 'inform','ack','clarify','question'.\n"
+    "- For plan: embed steps inline.\n"
+    "- For wait: event_type must be explicit.\n"
+    "- If something fails, emit state=error with details.\n"
+    "- Respect budgets and safety. If uncertain, prefer asking for clarification.\n"
+    "- Never include chain-of-thought or prose outside the JSON envelope.\n"
+    "\n"
+    "Conversation Flow Control:\n"
+    "- Use meta.continue: true/false to control whether the conversation should continue after this envelope\n"
+    "- Set meta.continue: true ONLY when you need to perform multiple automated steps without user input\n"
+    "- Set meta.continue: false when you're waiting for user response or the conversation is complete\n"
+    "- For simple conversation responses (questions, suggestions, information), ALWAYS set meta.continue: false\n"
+    "- For multi-step automated tasks (file operations, data processing), set meta.continue: true\n"
+    "- When you ask the user a question or present options, ALWAYS set meta.continue: false to wait for their response\n"
+    "- If you're unsure, default to meta.continue: false to avoid conversation loops\n"
+    "\n"
+    "Goal Management:\n"
+    "- You can update the current goal using meta.goal_update: {new_goal: string, reason: string}\n"
+    "- You can manage a todo list using meta.todo_update: {action: 'add'|'remove'|'complete'|'update', todo: {id: string, content: string, status: 'pending'|'in_progress'|'completed', priority: 'low'|'medium'|'high', related_files: [string], notes: string, dependencies: [string], created_at: string, updated_at: string}, reason: string}\n"
+    "- Use goal updates when the user's request changes the overall objective\n"
+    "- Use todo updates to track multi-step tasks and maintain progress\n"
+    "- Enhanced todo fields:\n"
+    "  - priority: Set task importance (low/medium/high)\n"
+    "  - related_files: Track which files are relevant to this task\n"
+    "  - notes: Add contextual information, debugging insights, or important details\n"
+    "  - dependencies: Track task relationships and prerequisites\n"
+    "  - created_at/updated_at: Track task timeline (ISO format)\n"
+)
+
+
 def _build_messages(context: Dict[str, Any], tools_summary: str, budgets: Dict[str, Any]) -> List[Dict[str, str]]:
     goal = context.get("goal", "")
     last_obs = context.get("last_observation")
@@ -432,56 +525,6 @@ def _build_messages(context: Dict[str, Any], tools_summary: str, budgets: Dict[s
     todo_list = context.get("todo_list", [])
     history = context.get("history", [])
 
-    system = (
-        "You are an autonomous agent. ALWAYS output exactly one JSON envelope, no prose.\n"
-        "Schema:\n"
-        "{\n"
-        "  envelope_id: string,\n"
-        "  timestamp: ISO-8601 string,\n"
-        "  state: one of [message, tool, plan, finish, ask_human, wait, handoff, reflect, error],\n"
-        "  brief_rationale: string,\n"
-        "  conversation?: {utterance, dialogue_act, target},\n"
-        "  tool?: string,\n"
-        "  arguments?: object,\n"
-        "  server_label?: string,\n"
-        "  plan?: {root_task, steps, execution_mode, confidence, revision},\n"
-        "  wait?: {event_type, timeout},\n"
-        "  finish?: {summary, artifacts},\n"
-        "  handoff?: {to_agent, message, context},\n"
-        "  reflect?: {analysis, next_action},\n"
-        "  error?: {error_type, error_message, suggested_repair},\n"
-        "  meta?: {budget:{...}, risk:{level,reason}, goal_update?:{...}, todo_update?:{...}, continue?: boolean}\n"
-        "}\n"
-        "Rules:\n"
-        "- Respond with ONLY this JSON object.\n"
-        "- For conversation, use state=message + conversation. dialogue_act can be 'inform','ack','clarify','question'.\n"
-        "- For plan: embed steps inline.\n"
-        "- For wait: event_type must be explicit.\n"
-        "- If something fails, emit state=error with details.\n"
-        "- Respect budgets and safety. If uncertain, prefer asking for clarification.\n"
-        "- Never include chain-of-thought or prose outside the JSON envelope.\n"
-        "\n"
-        "Conversation Flow Control:\n"
-        "- Use meta.continue: true/false to control whether the conversation should continue after this envelope\n"
-        "- Set meta.continue: true ONLY when you need to perform multiple automated steps without user input\n"
-        "- Set meta.continue: false when you're waiting for user response or the conversation is complete\n"
-        "- For simple conversation responses (questions, suggestions, information), ALWAYS set meta.continue: false\n"
-        "- For multi-step automated tasks (file operations, data processing), set meta.continue: true\n"
-        "- When you ask the user a question or present options, ALWAYS set meta.continue: false to wait for their response\n"
-        "- If you're unsure, default to meta.continue: false to avoid conversation loops\n"
-        "\n"
-        "Goal Management:\n"
-        "- You can update the current goal using meta.goal_update: {new_goal: string, reason: string}\n"
-        "- You can manage a todo list using meta.todo_update: {action: 'add'|'remove'|'complete'|'update', todo: {id: string, content: string, status: 'pending'|'in_progress'|'completed', priority: 'low'|'medium'|'high', related_files: [string], notes: string, dependencies: [string], created_at: string, updated_at: string}, reason: string}\n"
-        "- Use goal updates when the user's request changes the overall objective\n"
-        "- Use todo updates to track multi-step tasks and maintain progress\n"
-        "- Enhanced todo fields:\n"
-        "  - priority: Set task importance (low/medium/high)\n"
-        "  - related_files: Track which files are relevant to this task\n"
-        "  - notes: Add contextual information, debugging insights, or important details\n"
-        "  - dependencies: Track task relationships and prerequisites\n"
-        "  - created_at/updated_at: Track task timeline (ISO format)\n"
-    )
     servers_info = ""
     try:
         servers = context.get("mcp_servers") or {}
@@ -581,12 +624,17 @@ def _build_messages(context: Dict[str, Any], tools_summary: str, budgets: Dict[s
         "- Use state=tool to retry the tool call with corrected parameters\n"
     )
     return [
-        {"role": "system", "content": system},
+        {"role": "system", "content": _SYSTEM_PROMPT},
         {"role": "user", "content": user},
     ]
 
 
-def _call_openai_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool, Dict[str, Any] | str]:
+async def _acall_openai_json(messages: List[Dict[str, str]], model: str, chain: Dict[str, Any] | None = None) -> Tuple[bool, Dict[str, Any] | str]:
+    """
+    chain, when given, links calls of one attempt: after the first Responses API call it
+    records the response id, and follow-up (repair) calls send only the messages appended
+    after the original prompt with previous_response_id instead of resending everything.
+    """
     kind, client_ctor = _try_import_openai()
     if kind is None:
         logger.error("OpenAI SDK not installed")
@@ -594,15 +642,23 @@ def _call_openai_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool,
 
     try:
         if kind == "new":
-            client = client_ctor()
+            client = _async_client("openai", client_ctor)
             # Prefer Responses API if available (omit temperature if unsupported)
             try:
-                logger.debug("Calling Responses API model=%s (json_object)", model)
-                resp = client.responses.create(
+                prev_id = (chain or {}).get("openai_response_id")
+                to_send = messages[chain["openai_base"]:] if prev_id else messages  # type: ignore[index]
+                extra: Dict[str, Any] = {"previous_response_id": prev_id} if prev_id else {}
+                logger.debug("Calling Responses API model=%s (json_object) chained=%s", model, bool(prev_id))
+                resp = await client.responses.create(
                     model=model,
-                    input=[{"role": m["role"], "content": [{"type": "text", "text": m["content"]}]} for m in messages],
+                    input=[{"role": m["role"], "content": [{"type": "text", "text": m["content"]}]} for m in to_send],
                     response_format={"type": "json_object"},
+                    **extra,
                 )
+                if chain is not None:
+                    if not prev_id:
+                        chain["openai_base"] = len(messages)
+                    chain["openai_response_id"] = getattr(resp, "id", None) or prev_id
                 # Extract text
                 text_parts = []
                 for item in getattr(resp, "output", []) or []:  # type: ignore[attr-defined]
@@ -622,7 +678,7 @@ def _call_openai_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool,
                 # Fallback to chat.completions style (if present)
                 try:
                     logger.debug("Falling back to chat.completions model=%s", model)
-                    resp = client.chat.completions.create(  # type: ignore[attr-defined]
+                    resp = await client.chat.completions.create(  # type: ignore[attr-defined]
                         model=model,
                         messages=messages,
                     )
@@ -641,7 +697,7 @@ def _call_openai_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool,
             openai = client_ctor
             try:
                 logger.debug("Legacy ChatCompletion model=%s", model)
-                resp = openai.ChatCompletion.create(
+                resp = await openai.ChatCompletion.acreate(
                     model=model,
                     messages=messages,
                 )
@@ -671,35 +727,51 @@ def _call_openai_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool,
         return False, f"OpenAI call failed: {e}"
 
 
-def _call_anthropic_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool, Dict[str, Any] | str]:
+def _call_openai_json(messages: List[Dict[str, str]], model: str, chain: Dict[str, Any] | None = None) -> Tuple[bool, Dict[str, Any] | str]:
+    """Synchronous wrapper around _acall_openai_json."""
+    return run_sync(_acall_openai_json(messages, model, chain))
+
+
+async def _acall_anthropic_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool, Dict[str, Any] | str]:
     kind, client_ctor = _try_import_anthropic()
     if kind is None:
         logger.error("Anthropic SDK not installed")
         return False, "Anthropic SDK not installed. Install 'anthropic' package to enable Claude decisions."
 
     try:
-        client = client_ctor()
+        client = _async_client("anthropic", client_ctor)
 
         # Convert messages to Anthropic format
-        system_message = ""
-        conversation_messages = []
+        system_blocks: List[Dict[str, Any]] = []
+        conversation_messages: List[Dict[str, Any]] = []
 
         for msg in messages:
-            if msg["role"] == "system":
-                system_message = msg["content"]
+            block = {"type": "text", "text": msg["content"]}
+            if msg["role"] == "system" and not conversation_messages:
+                system_blocks.append(block)
+            elif msg["role"] == "system":
+                # Late system turns (repair instructions) go after the cached prefix
+                conversation_messages[-1]["content"].append(block)
             else:
                 conversation_messages.append({
                     "role": msg["role"],
-                    "content": msg["content"]
+                    "content": [block]
                 })
 
+        # Cache breakpoints on the original system and user blocks: repair calls resend the
+        # same prefix and read it from the prompt cache, paying full price only for the errors
+        if system_blocks:
+            system_blocks[-1]["cache_control"] = _EPHEMERAL_CACHE
+        if conversation_messages:
+            conversation_messages[0]["content"][0]["cache_control"] = _EPHEMERAL_CACHE
+
         # Call Anthropic API
         logger.debug("Calling Anthropic API model=%s", model)
 
-        response = client.messages.create(
+        response = await client.messages.create(
             model=model,
             max_tokens=16000,
-            system=system_message,
+            system=system_blocks,
             messages=conversation_messages,
         )
 
@@ -710,6 +782,11 @@ def _call_anthropic_json(messages: List[Dict[str, str]], model: str) -> Tuple[bo
         if text:
             logger.debug("Anthropic text (trunc 1000): %s", text[:1000])
 
+            # A complete leading object is accepted as-is; trailing prose no longer looks like truncation
+            obj = _first_json_object(text)
+            if obj is not None:
+                return True, obj
+
             # Check for truncated response (unterminated strings/brackets)
             if text.count('{') != text.count('}') or text.count('[') != text.count(']'):
                 logger.warning("Response appears truncated - bracket mismatch detected")
@@ -734,9 +811,22 @@ def _call_anthropic_json(messages: List[Dict[str, str]], model: str) -> Tuple[bo
         return False, f"Anthropic call failed: {e}"
 
 
-def _decide_next_attempt(context: Dict[str, Any], workspace: Dict[str, Any], envelope_schema_path: Path, max_repairs: int = 2) -> Tuple[bool, Dict[str, Any] | List[str]]:
+def _call_anthropic_json(messages: List[Dict[str, str]], model: str) -> Tuple[bool, Dict[str, Any] | str]:
+    """Synchronous wrapper around _acall_anthropic_json."""
+    return run_sync(_acall_anthropic_json(messages, model))
+
+
+async def _acall_model_json(messages: List[Dict[str, str]], model: str, chain: Dict[str, Any] | None = None) -> Tuple[bool, Dict[str, Any] | str]:
+    # Determine which API to use based on model name
+    if model.startswith("claude"):
+        return await _acall_anthropic_json(messages, model)
+    return await _acall_openai_json(messages, model, chain)
+
+
+async def _decide_next_attempt(context: Dict[str, Any], workspace: Dict[str, Any], envelope_schema_path: Path, max_repairs: int = 2, tools_summary: str | None = None) -> Tuple[bool, Dict[str, Any] | List[str]]:
     """Single attempt at generating a valid envelope."""
-    tools_summary = _summarize_tools(workspace.get("tools", []))
+    if tools_summary is None:
+        tools_summary = _summarize_tools(workspace.get("tools", []))
     spend = ((workspace.get("policies") or {}).get("autonomy") or {}).get("spend_limits", {})
     budgets = {
         "tokens_remaining": spend.get("max_tokens"),
@@ -751,78 +841,64 @@ def _decide_next_attempt(context: Dict[str, Any], workspace: Dict[str, Any], env
         pass
     model = ((workspace.get("agent") or {}).get("model") or {}).get("name", DEFAULT_MODEL)
 
-    # Determine which API to use based on model name
-    if model.startswith("claude"):
-        ok, result = _call_anthropic_json(messages, model)
-    else:
-        ok, result = _call_openai_json(messages, model)
+    chain: Dict[str, Any] = {}
+    ok, result = await _acall_model_json(messages, model, chain)
 
     if not ok:
         return False, [str(result)]
 
     envelope = result  # type: ignore[assignment]
-    valid, errs = validate_envelope(envelope, envelope_schema_path)
+    errs: List[str] = []
     repairs = 0
 
+    # Validation and repair run off the shared background loop, which also carries MCP traffic
+    valid = await asyncio.to_thread(validate_envelope_fast, envelope, envelope_schema_path)
+
     # First try auto-repair if validation fails
     if not valid and isinstance(envelope, dict):
         logger.debug("Initial validation failed, attempting auto-repair")
-        auto_repaired = _auto_repair_envelope(envelope)
-        auto_valid, auto_errs = validate_envelope(auto_repaired, envelope_schema_path)
-        if auto_valid:
+        # Nothing else reads the model's envelope any more, so it can be repaired in place
+        auto_repaired = await asyncio.to_thread(_auto_repair_envelope, envelope)
+        if await asyncio.to_thread(validate_envelope_fast, auto_repaired, envelope_schema_path):
             logger.debug("Auto-repair successful")
-            return True, auto_repaired
-        else:
-            logger.debug("Auto-repair failed, %d errors remain", len(auto_errs))
-            envelope = auto_repaired  # Use the auto-repaired version for LLM repair
-            errs = auto_errs
+            return True, Envelope(auto_repaired, validated=True)
+        logger.debug("Auto-repair failed, falling back to LLM repair")
+        envelope = auto_repaired  # Use the auto-repaired version for LLM repair
 
     # If auto-repair didn't work, try LLM-based repair
     while not valid and repairs < max_repairs:
         # Ask the model to repair: append errors to the prompt
+        _, errs = await asyncio.to_thread(validate_envelope, envelope, envelope_schema_path)
         err_text = "\n".join(f"- {e}" for e in errs)
-        repair_msgs = messages + [
-            {
-                "role": "system",
-                "content": (
-                    "The previous JSON was invalid against the schema due to:\n" + err_text +
-                    "\nRe-emit a corrected JSON envelope only. Follow the schema exactly."
-                ),
-            }
-        ]
+        repair_msgs = [*messages, {"role": "system", "content": _REPAIR_PROMPT.format(errors=err_text)}]
         logger.debug("LLM repair attempt %d with %d errors", repairs + 1, len(errs))
 
         # Use the same provider logic as main call
-        if model.startswith("claude"):
-            ok, result = _call_anthropic_json(repair_msgs, model)
-        else:
-            ok, result = _call_openai_json(repair_msgs, model)
+        ok, result = await _acall_model_json(repair_msgs, model, chain)
 
         if not ok:
             logger.error("LLM repair call failed: %s", result)
             # Fall back to auto-repair if LLM repair fails
             if isinstance(envelope, dict):
-                fallback_repaired = _auto_repair_envelope(envelope)
-                fallback_valid, fallback_errs = validate_envelope(fallback_repaired, envelope_schema_path)
-                if fallback_valid:
+                fallback_repaired = await asyncio.to_thread(_auto_repair_envelope, envelope)
+                if await asyncio.to_thread(validate_envelope_fast, fallback_repaired, envelope_schema_path):
                     logger.debug("Fallback auto-repair successful")
-                    return True, fallback_repaired
+                    return True, Envelope(fallback_repaired, validated=True)
             return False, [str(result)]
 
         envelope = result  # type: ignore[assignment]
 
         # Try auto-repair on the LLM response too
-        if isinstance(envelope, dict):
-            pre_repair_valid, pre_repair_errs = validate_envelope(envelope, envelope_schema_path)
-            if not pre_repair_valid:
-                envelope = _auto_repair_envelope(envelope)
-
-        valid, errs = validate_envelope(envelope, envelope_schema_path)
+        valid = await asyncio.to_thread(validate_envelope_fast, envelope, envelope_schema_path)
+        if not valid and isinstance(envelope, dict):
+            envelope = await asyncio.to_thread(_auto_repair_envelope, envelope)
+            valid = await asyncio.to_thread(validate_envelope_fast, envelope, envelope_schema_path)
         repairs += 1
 
     if not valid:
         # Last resort: force a valid error envelope
         logger.warning("All repair attempts failed, creating fallback error envelope")
+        _, errs = await asyncio.to_thread(validate_envelope, envelope, envelope_schema_path)
         fallback_envelope = {
             "envelope_id": "fallback_error",
             "timestamp": "2024-01-01T00:00:00Z",
@@ -836,13 +912,16 @@ def _decide_next_attempt(context: Dict[str, Any], workspace: Dict[str, Any], env
         }
         return True, fallback_envelope
 
-    return True, envelope
+    # Tell run_one_cycle it can skip validating this envelope again
+    return True, Envelope(envelope, validated=True)
 
 
 def decide_next(context: Dict[str, Any], workspace: Dict[str, Any], envelope_schema_path: Path, max_repairs: int = 2, max_retries: int = 3) -> Tuple[bool, Dict[str, Any] | List[str]]:
     """
     Generate a valid envelope with exponential backoff retry logic.
 
+    Synchronous entry point; the work runs on the shared background event loop.
+
     Args:
         context: Current context state
         workspace: Workspace configuration
@@ -853,13 +932,19 @@ def decide_next(context: Dict[str, Any], workspace: Dict[str, Any], envelope_sch
     Returns:
         (success: bool, result: Dict | error_messages: List[str])
     """
-    import time
+    return run_sync(_decide_next_async(context, workspace, envelope_schema_path, max_repairs, max_retries))
+
+
+async def _decide_next_async(context: Dict[str, Any], workspace: Dict[str, Any], envelope_schema_path: Path, max_repairs: int = 2, max_retries: int = 3) -> Tuple[bool, Dict[str, Any] | List[str]]:
+    """Async body of decide_next; see decide_next for arguments and return value."""
     import random
 
     base_delay = 0.5  # Start with 500ms delay
     max_delay = 8.0   # Cap at 8 seconds
 
     last_errors = []
+    # Retries never change the tools, so the summary is built once per decide_next
+    tools_summary = _summarize_tools(workspace.get("tools", []))
 
     for attempt in range(max_retries + 1):  # +1 to include initial attempt
         if attempt > 0:
@@ -869,10 +954,10 @@ def decide_next(context: Dict[str, Any], workspace: Dict[str, Any], envelope_sch
             total_delay = delay + jitter
 
             logger.debug(f"Retry attempt {attempt}/{max_retries} after {total_delay:.2f}s delay")
-            time.sleep(total_delay)
+            await asyncio.sleep(total_delay)
 
         try:
-            success, result = _decide_next_attempt(context, workspace, envelope_schema_path, max_repairs)
+            success, result = await _decide_next_attempt(context, workspace, envelope_schema_path, max_repairs, tools_summary)
 
             if success:
                 if attempt > 0:
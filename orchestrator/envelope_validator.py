@@ -1,21 +1,61 @@
 import json
 from pathlib import Path
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 
 from jsonschema import Draft202012Validator
 
+try:
+    import orjson as _orjson
+except ImportError:  # optional speedup; stdlib json accepts bytes too
+    _orjson = None
+
+
+# schema_path -> (mtime_ns, compiled validator); rebuilt only when the schema file changes
+_VALIDATORS: Dict[Path, Tuple[int, Draft202012Validator]] = {}
+
+
+class Envelope(dict):
+    """Envelope dict; ``validated`` is True when it already passed schema validation."""
+
+    __slots__ = ("validated",)
+
+    def __init__(self, data=(), validated: bool = False):
+        super().__init__(data)
+        self.validated = validated
+
 
 def load_json(path: Path):
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except UnicodeDecodeError:
-        text = path.read_text(encoding="utf-8-sig")
-        return json.loads(text)
+    # One read; strip a UTF-8 BOM ourselves instead of re-reading with utf-8-sig
+    data = path.read_bytes()
+    if data.startswith(b"\xef\xbb\xbf"):
+        data = data[3:]
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def _get_validator(schema_path: Path) -> Draft202012Validator:
+    mtime = schema_path.stat().st_mtime_ns
+    cached = _VALIDATORS.get(schema_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    # No format_checker: "format" stays an annotation, as before, so date-time/regex checks never run
+    validator = Draft202012Validator(load_json(schema_path), format_checker=None)
+    _VALIDATORS[schema_path] = (mtime, validator)
+    return validator
+
+
+def validate_envelope_fast(envelope: dict, schema_path: Path) -> bool:
+    """Happy-path check: stops at the first error instead of collecting them all."""
+    return _get_validator(schema_path).is_valid(envelope)
 
 
 def validate_envelope(envelope: dict, schema_path: Path) -> Tuple[bool, List[str]]:
-    schema = load_json(schema_path)
-    validator = Draft202012Validator(schema)
+    return collect_errors(_get_validator(schema_path), envelope)
+
+
+def collect_errors(validator: Draft202012Validator, envelope: dict) -> Tuple[bool, List[str]]:
+    """Validate against an already compiled validator; same result shape as validate_envelope."""
     errors = sorted(validator.iter_errors(envelope), key=lambda e: e.path)
     if not errors:
         return True, []
@@ -35,4 +75,3 @@ if __name__ == "__main__":
     print("VALID" if ok else "INVALID")
     if not ok:
         print("\n".join(errs))
-
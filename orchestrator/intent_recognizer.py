@@ -52,6 +52,10 @@ class IntentRecognizer:
                 r'construction.*contract.*review'
             ]
         }
+        self._intent_names = list(self.intent_patterns)
+        self._compiled = [[re.compile(p) for p in pats] for pats in self.intent_patterns.values()]
+        # One alternation per intent rules it out in a single scan before counting individual patterns
+        self._gates = [re.compile("|".join(f"(?:{p})" for p in pats)) for pats in self.intent_patterns.values()]
 
     def recognize_intent(self, message: str) -> List[Tuple[str, float]]:
         """
@@ -66,12 +70,15 @@ class IntentRecognizer:
         message_lower = message.lower()
         results = []
 
-        for intent_name, patterns in self.intent_patterns.items():
+        for intent_name, gate, patterns in zip(self._intent_names, self._gates, self._compiled):
+            if gate.search(message_lower) is None:
+                continue
+
             confidence = 0.0
             matches = 0
 
             for pattern in patterns:
-                if re.search(pattern, message_lower):
+                if pattern.search(message_lower):
                     matches += 1
                     confidence = max(confidence, 0.8)  # Base confidence for pattern match
 
@@ -99,4 +106,4 @@ class IntentRecognizer:
         intents = self.recognize_intent(message)
         if intents and intents[0][1] >= threshold:
             return intents[0]
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import sys
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _new_loop() -> asyncio.AbstractEventLoop:
+    """uvloop on POSIX when installed, else the stdlib default (Proactor on Windows).
+
+    Only this thread's loop is affected; the global event loop policy is left alone.
+    """
+    if sys.platform != "win32":
+        try:
+            import uvloop  # type: ignore
+        except ImportError:
+            pass
+        else:
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+class LoopThread:
+    """One event loop running forever on a daemon thread.
+
+    Sync entry points submit coroutines here instead of calling asyncio.run, so
+    async clients, sessions and their connection pools outlive a single call.
+    """
+
+    def __init__(self, name: str = "orchestrator-loop") -> None:
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = _new_loop()
+                    thread = threading.Thread(target=loop.run_forever, name=self._name, daemon=True)
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run coro on the background loop and block until it finishes."""
+        if self._thread is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("LoopThread.run() called from its own loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def on_shutdown(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Register an async cleanup (e.g. closing a client) to run on the loop before it stops."""
+        self._shutdown_hooks.append(hook)
+
+    async def _run_shutdown_hooks(self) -> None:
+        hooks, self._shutdown_hooks = self._shutdown_hooks, []
+        for hook in reversed(hooks):
+            try:
+                await hook()
+            except Exception:
+                pass
+
+    def stop(self) -> None:
+        loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        if self._shutdown_hooks and thread is not threading.current_thread():
+            try:
+                asyncio.run_coroutine_threadsafe(self._run_shutdown_hooks(), loop).result(timeout=5)
+            except Exception:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+
+
+_LOOP = LoopThread()
+atexit.register(_LOOP.stop)
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Synchronous bridge onto the shared background loop."""
+    return _LOOP.run(coro, timeout)
+
+
+def on_shutdown(hook: Callable[[], Awaitable[None]]) -> None:
+    _LOOP.on_shutdown(hook)
@@ -14,6 +14,9 @@ from rich.console import Console
 
 console = Console()
 
+# Separate connect/read budgets: a dead host fails in 5s, a slow tool still gets 25s to answer
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5, sock_read=25)
+
 def _resolve_base_url() -> Optional[str]:
     """Resolve base HTTP URL from env or mcpServers.json.
 
@@ -55,12 +58,26 @@ def _resolve_base_url() -> Optional[str]:
 class MCPClient:
     """MCP Client for connecting to external MCP servers"""
     
-    def __init__(self, server_url: Optional[str] = None):
+    def __init__(self, server_url: Optional[str] = None, max_tool_calls: int = 8, max_resource_calls: int = 16):
         self.server_url = server_url or _resolve_base_url() or ""
         self.session = None
         self.connected = False
         self.available_tools = {}
         self.available_resources = {}
+        # Bulkheads: slow tools cannot starve resource fetches (or the loop) and vice versa
+        self._tool_limit = max_tool_calls
+        self._resource_limit = max_resource_calls
+        self._tool_sem = asyncio.Semaphore(max_tool_calls)
+        self._resource_sem = asyncio.Semaphore(max_resource_calls)
+        self._tool_in_flight = 0
+        self._resource_in_flight = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Bulkhead utilization, for tuning the pool sizes"""
+        return {
+            "tools": {"in_flight": self._tool_in_flight, "limit": self._tool_limit},
+            "resources": {"in_flight": self._resource_in_flight, "limit": self._resource_limit},
+        }
     
     async def connect(self):
         """Connect to the MCP server"""
@@ -113,17 +130,22 @@ class MCPClient:
             return {"error": f"Tool not found: {tool_name}", "success": False}
         
         try:
-            async with self.session.post(
-                f"{self.server_url}/tools/{tool_name}",
-                json=parameters,
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return {"success": True, "result": result}
-                else:
-                    error_text = await response.text()
-                    return {"error": f"HTTP {response.status}: {error_text}", "success": False}
+            async with self._tool_sem:
+                self._tool_in_flight += 1
+                try:
+                    async with self.session.post(
+                        f"{self.server_url}/tools/{tool_name}",
+                        json=parameters,
+                        timeout=_REQUEST_TIMEOUT
+                    ) as response:
+                        if response.status == 200:
+                            result = await response.json()
+                            return {"success": True, "result": result}
+                        else:
+                            error_text = await response.text()
+                            return {"error": f"HTTP {response.status}: {error_text}", "success": False}
+                finally:
+                    self._tool_in_flight -= 1
                     
         except asyncio.TimeoutError:
             return {"error": "Tool call timed out", "success": False}
@@ -139,16 +161,21 @@ class MCPClient:
             return {"error": f"Resource not found: {resource_name}", "success": False}
         
         try:
-            async with self.session.get(
-                f"{self.server_url}/resources/{resource_name}",
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return {"success": True, "result": result}
-                else:
-                    error_text = await response.text()
-                    return {"error": f"HTTP {response.status}: {error_text}", "success": False}
+            async with self._resource_sem:
+                self._resource_in_flight += 1
+                try:
+                    async with self.session.get(
+                        f"{self.server_url}/resources/{resource_name}",
+                        timeout=_REQUEST_TIMEOUT
+                    ) as response:
+                        if response.status == 200:
+                            result = await response.json()
+                            return {"success": True, "result": result}
+                        else:
+                            error_text = await response.text()
+                            return {"error": f"HTTP {response.status}: {error_text}", "success": False}
+                finally:
+                    self._resource_in_flight -= 1
                     
         except asyncio.TimeoutError:
             return {"error": "Resource fetch timed out", "success": False}
@@ -1,20 +1,140 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import functools
+import inspect
 import logging
-from urllib import request
 from urllib.parse import urljoin
-from typing import Any, Dict
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+
+import httpx
+
+try:
+    import orjson as _json
+except ImportError:  # optional speedup; stdlib json parses the same payloads
+    import json as _json
+
+try:
+    from .loop_thread import on_shutdown, run_sync  # type: ignore
+    from .response_cache import ResponseCache  # type: ignore
+except Exception:
+    import sys as _sys
+    from pathlib import Path as _Path
+    _sys.path.append(str(_Path(__file__).resolve().parent))
+    from loop_thread import on_shutdown, run_sync  # type: ignore
+    from response_cache import ResponseCache  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+# One pooled client per process: keep-alive sockets are reused across search/fetch calls
+_CLIENT = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    timeout=10.0,
+    headers={"Content-Type": "application/json"},
+)
+atexit.register(_CLIENT.close)
+
+# Async counterpart, created on first use; like the decide_next SDK clients it lives on the
+# shared background loop, which is where the sync fan-out helpers run it
+_ACLIENT: httpx.AsyncClient | None = None
+
+# Repeated identical search/fetch calls (common in agent loops) are served from memory
+_SEARCH_CACHE = ResponseCache(maxsize=256, ttl=60.0)
+_FETCH_CACHE = ResponseCache(maxsize=512)
+
+# Keys a fetch payload must carry to count as a document
+_FETCH_KEYS = frozenset(("id", "title", "text", "url"))
+
+# Map tool names to actual function names
+_TOOL_FUNCTION_MAP = {
+    "powershell": "execute_passthrough",
+    "execute_powershell": "execute_passthrough",
+    "shell": "execute_passthrough",
+    "bash": "execute_passthrough",
+    "python": "execute_python",
+    "python_eval": "execute_python_eval",
+    # Add more mappings as needed
+}
+
+# Map parameter names for specific tools
+_PARAMETER_MAPPINGS = {
+    "write_block": {
+        "content": "text",      # LLM sends 'content', function expects 'text'
+        "filename": "path"       # LLM sends 'filename', function expects 'path'
+    },
+}
+
+# Tool name -> (function name, resolved callable); filled lazily so importing this module
+# does not pull in the server
+_TOOL_FUNCS: Dict[str, Tuple[str, Callable[..., Any]]] = {}
+_SERVER: Any = None
+
+# func -> (accepted names, required names, all names in declaration order)
+_SIG_CACHE: Dict[Callable[..., Any], Tuple[FrozenSet[str], Tuple[str, ...], Tuple[str, ...]]] = {}
+
+
+def _signature_info(func: Callable[..., Any]) -> Tuple[FrozenSet[str], Tuple[str, ...], Tuple[str, ...]]:
+    info = _SIG_CACHE.get(func)
+    if info is None:
+        params = inspect.signature(func).parameters
+        info = (
+            frozenset(params),
+            tuple(p.name for p in params.values() if p.default is inspect.Parameter.empty),
+            tuple(params),
+        )
+        _SIG_CACHE[func] = info
+    return info
+
+
+def _server_module() -> Any:
+    global _SERVER
+    if _SERVER is None:
+        import combined_mcp_server
+        _SERVER = combined_mcp_server
+    return _SERVER
+
+
+def _resolve_tool(name: str) -> Tuple[str, Callable[..., Any] | None]:
+    entry = _TOOL_FUNCS.get(name)
+    if entry is not None:
+        return entry
+    func_name = _TOOL_FUNCTION_MAP.get(name, name)
+    func = getattr(_server_module(), func_name, None)
+    if func is not None:
+        _TOOL_FUNCS[name] = (func_name, func)
+    return func_name, func
+
 
 def _post_json(url: str, payload: Dict[str, Any], timeout: float = 10.0) -> Dict[str, Any]:
-    data = json.dumps(payload).encode("utf-8")
-    req = request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
-    with request.urlopen(req, timeout=timeout) as resp:
-        body = resp.read().decode("utf-8", errors="ignore")
-        return json.loads(body)
+    resp = _CLIENT.post(url, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    return _json.loads(resp.content)
+
+
+def _aclient() -> httpx.AsyncClient:
+    global _ACLIENT
+    if _ACLIENT is None:
+        _ACLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=10.0,
+            headers={"Content-Type": "application/json"},
+        )
+        on_shutdown(_close_aclient)
+    return _ACLIENT
+
+
+async def _close_aclient() -> None:
+    global _ACLIENT
+    client, _ACLIENT = _ACLIENT, None
+    if client is not None:
+        await client.aclose()
+
+
+async def _apost_json(url: str, payload: Dict[str, Any], timeout: float = 10.0) -> Dict[str, Any]:
+    resp = await _aclient().post(url, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    return _json.loads(resp.content)
 
 
 def _normalize_base(server_url: str) -> str:
@@ -25,14 +145,39 @@ def _normalize_base(server_url: str) -> str:
     return s + "/"
 
 
+@functools.lru_cache(maxsize=64)
+def _tool_url(server_url: str, tool: str) -> str:
+    return urljoin(_normalize_base(server_url), f"tools/{tool}")
+
+
+def clear_cache() -> None:
+    _SEARCH_CACHE.clear()
+    _FETCH_CACHE.clear()
+
+
 def search(server_url: str, query: str) -> Dict[str, Any]:
-    base = _normalize_base(server_url)
-    obj = _post_json(urljoin(base, "tools/search"), {"query": query})
+    key = (server_url, query)
+    cached = _SEARCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    return _SEARCH_CACHE.put(key, _parse_search(_post_json(_tool_url(server_url, "search"), {"query": query})))
+
+
+async def search_async(server_url: str, query: str) -> Dict[str, Any]:
+    key = (server_url, query)
+    cached = _SEARCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    obj = await _apost_json(_tool_url(server_url, "search"), {"query": query})
+    return _SEARCH_CACHE.put(key, _parse_search(obj))
+
+
+def _parse_search(obj: Dict[str, Any]) -> Dict[str, Any]:
     items = obj.get("content") or []
     for item in items:
         if item.get("type") == "text":
             try:
-                payload = json.loads(item.get("text") or "{}")
+                payload = _json.loads(item.get("text") or "{}")
                 if isinstance(payload, dict) and "results" in payload:
                     return {"results": payload["results"]}
             except Exception:
@@ -41,95 +186,94 @@ def search(server_url: str, query: str) -> Dict[str, Any]:
 
 
 def fetch(server_url: str, id: str) -> Dict[str, Any]:
-    base = _normalize_base(server_url)
-    obj = _post_json(urljoin(base, "tools/fetch"), {"id": id})
+    key = (server_url, id)
+    cached = _FETCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    return _FETCH_CACHE.put(key, _parse_fetch(_post_json(_tool_url(server_url, "fetch"), {"id": id})))
+
+
+async def fetch_async(server_url: str, id: str) -> Dict[str, Any]:
+    key = (server_url, id)
+    cached = _FETCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    obj = await _apost_json(_tool_url(server_url, "fetch"), {"id": id})
+    return _FETCH_CACHE.put(key, _parse_fetch(obj))
+
+
+def _parse_fetch(obj: Dict[str, Any]) -> Dict[str, Any]:
     items = obj.get("content") or []
     for item in items:
         if item.get("type") == "text":
             try:
-                payload = json.loads(item.get("text") or "{}")
-                if isinstance(payload, dict) and {"id", "title", "text", "url"}.issubset(payload.keys()):
+                payload = _json.loads(item.get("text") or "{}")
+                if isinstance(payload, dict) and _FETCH_KEYS.issubset(payload):
                     return payload
             except Exception:
                 pass
     return {"error": "unexpected_mcp_fetch_output", "raw": obj}
 
 
+async def _gather_settled(coros: List[Any]) -> List[Dict[str, Any]]:
+    results = await asyncio.gather(*coros, return_exceptions=True)
+    return [{"error": str(r)} if isinstance(r, Exception) else r for r in results]
+
+
+def search_many(server_url: str, queries: List[str]) -> List[Dict[str, Any]]:
+    """Run several searches concurrently; a failed one yields {"error": ...} in its slot."""
+    return run_sync(_gather_settled([search_async(server_url, q) for q in queries]))
+
+
+def fetch_many(server_url: str, ids: List[str]) -> List[Dict[str, Any]]:
+    """Fetch several documents concurrently; a failed one yields {"error": ...} in its slot."""
+    return run_sync(_gather_settled([fetch_async(server_url, i) for i in ids]))
+
+
 def call_tool(name: str, arguments: Dict[str, Any], server_url: str = "http://localhost:8000") -> Dict[str, Any]:
     """Call a tool via DIRECT HTTP to the MCP server"""
     try:
-        import combined_mcp_server
-
         # Handle workflow tools specially - they use the generic start_workflow function
-        if "workflow" in name and name.startswith("start_") and name.endswith("_workflow"):
+        if name.startswith("start_") and name.endswith("_workflow"):
             # Extract template_id from tool name: start_system_info_workflow -> system_info
             template_id = name[6:-9]  # Remove "start_" prefix and "_workflow" suffix
-            result = combined_mcp_server.start_workflow(template_id)
+            result = _server_module().start_workflow(template_id)
             return {"text": str(result), "is_error": False}
+
+        func_name, func = _resolve_tool(name)
+        if func is None:
+            return {"error": f"Tool '{name}' (function '{func_name}') not found", "is_error": True}
+
+        # Apply parameter mappings if needed; unmapped tools use the caller's dict as-is
+        # (read-only from here on, so it is never mutated)
+        param_map = _PARAMETER_MAPPINGS.get(name)
+        if param_map is None:
+            mapped_arguments = arguments
         else:
-            # Map tool names to actual function names
-            tool_function_map = {
-                "powershell": "execute_passthrough",
-                "execute_powershell": "execute_passthrough",
-                "shell": "execute_passthrough",
-                "bash": "execute_passthrough",
-                "python": "execute_python",
-                "python_eval": "execute_python_eval",
-                # Add more mappings as needed
-            }
-
-            # Map parameter names for specific tools
-            parameter_mappings = {
-                "write_block": {
-                    "content": "text",      # LLM sends 'content', function expects 'text'
-                    "filename": "path"       # LLM sends 'filename', function expects 'path'
-                },
-            }
-
-            # Get the actual function name
-            func_name = tool_function_map.get(name, name)
-
-            # Apply parameter mappings if needed
-            mapped_arguments = arguments.copy()
-            if name in parameter_mappings:
-                for llm_param, func_param in parameter_mappings[name].items():
-                    if llm_param in mapped_arguments:
-                        mapped_arguments[func_param] = mapped_arguments.pop(llm_param)
-
-            # Try to call the function
-            if hasattr(combined_mcp_server, func_name):
-                func = getattr(combined_mcp_server, func_name)
-
-                # Log the call for debugging
-                import inspect
-                sig = inspect.signature(func)
-
-                # Filter out parameters that don't exist in the function signature
-                valid_params = list(sig.parameters.keys())
-                invalid_params = [param for param in mapped_arguments.keys() if param not in valid_params]
-
-                # Remove invalid parameters with warning
-                if invalid_params:
-                    logger.warning(f"Tool '{name}' received invalid parameters: {invalid_params}. Removing them.")
-                    for invalid_param in invalid_params:
-                        mapped_arguments.pop(invalid_param, None)
-
-                required_params = [p for p in sig.parameters.values() if p.default == inspect.Parameter.empty]
-
-                # Check if all required parameters are provided
-                missing_params = [p.name for p in required_params if p.name not in mapped_arguments]
-                if missing_params:
-                    error_msg = f"Tool '{name}' missing required parameters: {missing_params}. "
-                    error_msg += f"Provided parameters: {list(mapped_arguments.keys())}. "
-                    error_msg += f"Expected parameters: {list(sig.parameters.keys())}. "
-                    error_msg += f"Please retry with all required parameters."
-                    return {"error": error_msg, "is_error": True}
-
-                result = func(**mapped_arguments)
-                return {"text": str(result), "is_error": False}
-            else:
-                return {"error": f"Tool '{name}' (function '{func_name}') not found", "is_error": True}
+            mapped_arguments = {param_map.get(k, k): v for k, v in arguments.items()}
+
+        # Signature metadata is computed once per function
+        valid_params, required_params, all_params = _signature_info(func)
+
+        # Filter out parameters that don't exist in the function signature
+        invalid_params = [param for param in mapped_arguments if param not in valid_params]
+
+        # Remove invalid parameters with warning
+        if invalid_params:
+            logger.warning(f"Tool '{name}' received invalid parameters: {invalid_params}. Removing them.")
+            mapped_arguments = {k: v for k, v in mapped_arguments.items() if k in valid_params}
+
+        # Check if all required parameters are provided
+        missing_params = [p for p in required_params if p not in mapped_arguments]
+        if missing_params:
+            error_msg = f"Tool '{name}' missing required parameters: {missing_params}. "
+            error_msg += f"Provided parameters: {list(mapped_arguments.keys())}. "
+            error_msg += f"Expected parameters: {list(all_params)}. "
+            error_msg += f"Please retry with all required parameters."
+            return {"error": error_msg, "is_error": True}
+
+        result = func(**mapped_arguments)
+        return {"text": str(result), "is_error": False}
 
     except Exception as e:
         return {"error": f"DIRECT call_tool failed: {e}", "is_error": True}
-
@@ -1,10 +1,32 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional
 
+try:
+    from .response_cache import ResponseCache  # type: ignore
+except Exception:
+    import sys as _sys
+    from pathlib import Path as _Path
+    _sys.path.append(str(_Path(__file__).resolve().parent))
+    from response_cache import ResponseCache  # type: ignore
 
+# One OpenAI client per process so consecutive calls share its keep-alive pool
+_CLIENT: Optional[Any] = None
+_CLIENT_LOCK = threading.Lock()
+
+# Repeated identical search/fetch calls (common in agent loops) are served from memory
+_SEARCH_CACHE = ResponseCache(maxsize=256, ttl=60.0)
+_FETCH_CACHE = ResponseCache(maxsize=512)
+
+# Keys a fetch payload must carry to count as a document
+_FETCH_KEYS = frozenset(("id", "title", "text", "url"))
+
+
+@functools.lru_cache(maxsize=1)
 def _try_openai_client():
     try:
         from openai import OpenAI  # type: ignore
@@ -17,13 +39,22 @@ def _try_openai_client():
             return (None, None)
 
 
+def _get_client() -> Any:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                kind, client_ctor = _try_openai_client()
+                if kind is None:
+                    raise RuntimeError("OpenAI SDK not installed")
+                if kind != "new":
+                    raise RuntimeError("Responses API requires the new OpenAI SDK")
+                _CLIENT = client_ctor()
+    return _CLIENT
+
+
 def _call_responses_mcp(server_label: str, server_url: str, prompt_user: str) -> str:
-    kind, client_ctor = _try_openai_client()
-    if kind is None:
-        raise RuntimeError("OpenAI SDK not installed")
-    if kind != "new":
-        raise RuntimeError("Responses API requires the new OpenAI SDK")
-    client = client_ctor()
+    client = _get_client()
     resp = client.responses.create(
         model=os.getenv("MCP_MODEL", "o4-mini-deep-research"),
         input=[
@@ -59,11 +90,24 @@ def _call_responses_mcp(server_label: str, server_url: str, prompt_user: str) ->
     return "\n".join(parts).strip()
 
 
+def clear_cache() -> None:
+    _SEARCH_CACHE.clear()
+    _FETCH_CACHE.clear()
+
+
 def search(server_label: str, server_url: str, query: str) -> Dict[str, Any]:
     """
     Calls an MCP server via OpenAI Responses API to perform a search.
     Returns {results: [{id,title,url}, ...]}.
     """
+    key = (server_label, server_url, query)
+    cached = _SEARCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    return _SEARCH_CACHE.put(key, _search(server_label, server_url, query))
+
+
+def _search(server_label: str, server_url: str, query: str) -> Dict[str, Any]:
     text = _call_responses_mcp(server_label, server_url, f"SEARCH: {query}")
     # The MCP server returns a content item whose text is a JSON-encoded object with a `results` array.
     try:
@@ -80,10 +124,18 @@ def fetch(server_label: str, server_url: str, id: str) -> Dict[str, Any]:
     Calls an MCP server via OpenAI Responses API to fetch a document by id.
     Returns {id,title,text,url,metadata?}.
     """
+    key = (server_label, server_url, id)
+    cached = _FETCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    return _FETCH_CACHE.put(key, _fetch(server_label, server_url, id))
+
+
+def _fetch(server_label: str, server_url: str, id: str) -> Dict[str, Any]:
     text = _call_responses_mcp(server_label, server_url, f"FETCH: {id}")
     try:
         obj = json.loads(text)
-        if isinstance(obj, dict) and {"id", "title", "text", "url"}.issubset(obj.keys()):
+        if isinstance(obj, dict) and _FETCH_KEYS.issubset(obj):
             return obj
     except Exception:
         pass
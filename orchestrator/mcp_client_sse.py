@@ -1,27 +1,144 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
+import logging
 import os
+import urllib.parse
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson as _json
+    _dumps = _json.dumps
+except ImportError:  # optional speedup; stdlib json parses the same payloads
+    _json = json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
 
 from mcp.client.sse import aconnect_sse
 from mcp.client.session import ClientSession
 try:
     from .debug import get_logger  # type: ignore
+    from .loop_thread import on_shutdown, run_sync  # type: ignore
 except Exception:
     import sys as _sys
     from pathlib import Path as _Path
     _sys.path.append(str(_Path(__file__).resolve().parent))
     from debug import get_logger  # type: ignore
+    from loop_thread import on_shutdown, run_sync  # type: ignore
 
 
 logger = get_logger("mcp_client_sse")
 
 _SESSIONS: dict[str, ClientSession] = {}
+_CONNECTING: dict[str, asyncio.Future] = {}  # url -> in-flight _connect, shared by concurrent callers
 _ACMS: dict[str, any] = {}
 
+# Callers that only read "structured" can skip joining the text blocks that mirror it;
+# same switch as mcp_client_stdio so both transports produce the same result shape
+_SKIP_TEXT_FLATTEN = os.getenv("MCP_SKIP_TEXT_FLATTEN", "0") == "1"
+
+# Seconds to wait for the server's 'endpoint' event on a fresh SSE stream
+_ENDPOINT_TIMEOUT = 10.0
+# Outbound JSON-RPC messages that may queue ahead of the POST sender
+_OUTBOUND_BUFFER = 8
+
+# Seconds a JSON-RPC batch may wait for all of its replies once the POST was accepted
+_BATCH_TIMEOUT = float(os.getenv("MCP_BATCH_TIMEOUT", "300"))
+
+# Ids for our own JSON-RPC batch requests; strings never collide with the session's integer ids
+_BATCH_IDS = itertools.count(1)
+
+# Pre-encoded so httpx does not rebuild the header list for every POST
+_JSON_HEADERS = [(b"content-type", b"application/json")]
+
+# Shared across sessions: one pool for message POSTs, one for the long-lived event streams
+_POST_CLIENT: Any = None
+_SSE_CLIENT: Any = None
+
+
+def _http_clients() -> Tuple[Any, Any]:
+    global _POST_CLIENT, _SSE_CLIENT
+    if _POST_CLIENT is None:
+        import httpx
+        _POST_CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+            timeout=30.0,
+        )
+        _SSE_CLIENT = httpx.AsyncClient(timeout=60.0)  # Longer timeout for event streams
+        on_shutdown(_close_http_clients)
+    return _POST_CLIENT, _SSE_CLIENT
+
+
+async def _close_http_clients() -> None:
+    global _POST_CLIENT, _SSE_CLIENT
+    # Stop the per-session readers/senders first so closing the pools does not surface as stream errors
+    for pending in list(_CONNECTING.values()):
+        pending.cancel()
+    owners = [owner for url in list(_ACMS) if (owner := _drop_session(url)) is not None]
+    await asyncio.gather(*owners, return_exceptions=True)
+    _SESSIONS.clear()
+    clients, _POST_CLIENT, _SSE_CLIENT = (_POST_CLIENT, _SSE_CLIENT), None, None
+    for client in clients:
+        if client is not None:
+            await client.aclose()
+
+
+def _dump_message(message: Any) -> bytes:
+    """Serialize a JSON-RPC model straight to UTF-8 JSON, without an intermediate dict or str."""
+    serializer = getattr(message, "__pydantic_serializer__", None)
+    if serializer is not None:
+        return serializer.to_json(message, by_alias=True, exclude_none=True)
+    return message.json(by_alias=True, exclude_none=True).encode()  # pydantic v1
+
+
+def _post_url(sse_url: str, messages_url: str) -> str:
+    """Absolute messages POST URL for an SSE session, with the long-poll timeout param."""
+    # Build absolute URL for messages endpoint from the original SSE URL origin
+    origin = urllib.parse.urlsplit(sse_url)
+    base_origin = f"{origin.scheme}://{origin.netloc}"
+    # messages_url is expected to start with '/messages/...'
+    full_url = urllib.parse.urljoin(base_origin, messages_url)
+    # Ensure timeout param is present for long polling
+    parsed = urllib.parse.urlsplit(full_url)
+    q = (parsed.query + "&" if parsed.query else "") + "timeout=30"
+    return urllib.parse.urlunsplit((parsed.scheme, parsed.netloc, parsed.path, q, parsed.fragment))
+
+
+_HERE = Path(__file__).resolve().parent
+_CONFIG_CANDIDATES = (_HERE / "mcpServers.json", _HERE.parent / "mcpServers.json", _HERE.parent.parent / "mcpServers.json")
+
+# config path -> (mtime_ns, has servers, url); a file is re-parsed only when it changes
+_CONFIG_URLS: Dict[Path, Tuple[int, bool, Optional[str]]] = {}
+
+
+def _url_from_config(cfg: Path, mtime: int) -> Tuple[bool, Optional[str]]:
+    cached = _CONFIG_URLS.get(cfg)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+    try:
+        data = json.loads(cfg.read_text(encoding="utf-8"))
+    except Exception:
+        data = json.loads(cfg.read_text(encoding="utf-8-sig"))
+    servers = data.get("servers", [])
+    default_label = data.get("default_label")
+    url = servers[0].get("url") if servers else None
+    if default_label:
+        for s in servers:
+            if s.get("label") == default_label:
+                url = s.get("url")
+                break
+    _CONFIG_URLS[cfg] = (mtime, bool(servers), url)
+    return bool(servers), url
+
+
+def reload_mcp_config() -> None:
+    """Forget parsed mcpServers.json files; edits are also picked up via mtime."""
+    _CONFIG_URLS.clear()
+
 
 def _load_mcp_url() -> Optional[str]:
     """Resolve SSE URL from env or mcpServers.json.
@@ -35,192 +152,349 @@ def _load_mcp_url() -> Optional[str]:
         return url
     # Try common config locations
     try:
-        root = Path(__file__).resolve().parent.parent
-        here = Path(__file__).resolve().parent
-        for cfg in [here / "mcpServers.json", root / "mcpServers.json", root.parent / "mcpServers.json"]:
-            if not cfg.exists():
-                continue
+        for cfg in _CONFIG_CANDIDATES:
             try:
-                data = json.loads(cfg.read_text(encoding="utf-8"))
-            except Exception:
-                data = json.loads(cfg.read_text(encoding="utf-8-sig"))
-            servers = data.get("servers", [])
-            default_label = data.get("default_label")
-            if default_label:
-                for s in servers:
-                    if s.get("label") == default_label:
-                        return s.get("url")
-            if servers:
-                return servers[0].get("url")
+                mtime = cfg.stat().st_mtime_ns
+            except OSError:
+                continue
+            has_servers, url = _url_from_config(cfg, mtime)
+            if has_servers:
+                return url
     except Exception:
         return None
     return None
 
 
-async def _ensure_session(server_url: Optional[str] = None) -> ClientSession:
+def _drop_session(url: str) -> Optional[asyncio.Task]:
+    """Forget the session for url and tell its owner task to tear it down; returns that task."""
+    _SESSIONS.pop(url, None)
+    resources = _ACMS.pop(url, None)
+    if resources is None:
+        return None
+    resources["stop"].set()
+    return resources["owner"]
+
+
+async def _ensure_session(server_url: Optional[str] = None) -> Tuple[ClientSession, Dict[str, Any]]:
+    """Return the cached session and batch state for this URL, connecting at most once at a time."""
     url = server_url or _load_mcp_url()
     if not url:
         raise RuntimeError("MCP_SSE_URL not configured and no mcpServers.json found")
-    if url in _SESSIONS:
-        return _SESSIONS[url]
+    resources = _ACMS.get(url)
+    if resources is not None:
+        if not resources["event_task"].done():
+            return resources["session"], resources["batch"]
+        logger.info("SSE stream for %s ended; reconnecting", url)
+        _drop_session(url)
+    pending = _CONNECTING.get(url)
+    if pending is None:
+        pending = _CONNECTING[url] = asyncio.ensure_future(_connect(url))
+        pending.add_done_callback(lambda _f, url=url: _CONNECTING.pop(url, None))
+    return await asyncio.shield(pending)
+
 
+async def _connect(url: str) -> Tuple[ClientSession, Dict[str, Any]]:
     # simple retry with backoff
     delays = [0.2, 0.5, 1.0, 2.0]
     last_err = None
+    loop = asyncio.get_running_loop()
     for d in delays:
+        started = loop.create_future()
+        stop = asyncio.Event()
+        owner = asyncio.create_task(_own_session(url, started, stop))
         try:
-            logger.debug("Connecting SSE to %s", url)
-            import httpx
-            from httpx_sse import aconnect_sse
-            from mcp.types import JSONRPCMessage
-            from mcp.shared.message import SessionMessage
-            import anyio
-
-            client = httpx.AsyncClient()
-
-            # Create proper duplex streams for ClientSession
-            server_to_client_stream, client_from_server_stream = anyio.create_memory_object_stream(100)
-            client_to_server_stream, server_from_client_stream = anyio.create_memory_object_stream(100)
-
-            # We'll obtain the messages endpoint from the SAME SSE connection we keep open
-            messages_url: Optional[str] = None
-            messages_ready = asyncio.Event()
-
-            # Long-lived event processing task (single persistent SSE connection)
-            async def process_events():
-                """Continuously read SSE events and forward to client"""
-                event_client = httpx.AsyncClient(timeout=60.0)  # Longer timeout for event stream
-                try:
-                    async with aconnect_sse(event_client, "GET", url) as event_source:
-                        logger.info("SSE event processing started: %s", url)
-                        async for event in event_source.aiter_sse():
-                            # Log at INFO so it's visible without DEBUG
-                            preview = (event.data[:200] + "...") if (event.data and len(event.data) > 200) else event.data
-                            logger.info("SSE event: %s", event.event)
-                            logger.debug("SSE event data: %s", preview)
-                            # The first event should provide the messages endpoint for this session
-                            if event.event == 'endpoint' and event.data:
-                                nonlocal messages_url
-                                messages_url = event.data.strip()
-                                logger.info("Messages endpoint: %s", messages_url)
-                                messages_ready.set()
-                                continue
-                            # Forward any non-endpoint event with JSON payload as JSON-RPC
-                            if event.data and event.event != 'endpoint':
-                                try:
-                                    # Parse SSE data as JSON-RPC message and wrap in SessionMessage
-                                    data = json.loads(event.data)
-                                    jsonrpc_message = JSONRPCMessage(**data)
-                                    message = SessionMessage(message=jsonrpc_message)
-                                    await server_to_client_stream.send(message)
-                                    logger.debug("Forwarded SSE message to client")
-                                except Exception as e:
-                                    logger.warning("Failed to parse SSE event: %s", e)
-                except Exception as e:
-                    logger.error("SSE event processing failed: %s", e, exc_info=True)
-                    # Try to send error through the stream if still open
-                    try:
-                        error_msg = SessionMessage(message=JSONRPCMessage(
-                            jsonrpc="2.0",
-                            error={"code": -32000, "message": str(e)},
-                            id=None
-                        ))
-                        await server_to_client_stream.send(error_msg)
-                    except Exception as stream_err:
-                        logger.debug("Could not send error through closed stream: %s", stream_err)
-                finally:
-                    try:
-                        await event_client.aclose()
-                    except Exception as close_err:
-                        logger.debug("Error closing event client: %s", close_err)
-
-            # Start event processing in background (discovers messages_url and handles responses)
-            event_task = asyncio.create_task(process_events())
-
-            async def message_sender():
-                """Send messages from client to server via HTTP POST"""
-                try:
-                    # Wait until the messages endpoint is known for this SSE session
-                    await messages_ready.wait()
-                    assert messages_url is not None
-                    async for message in server_from_client_stream:
-                        # Convert message to JSON and POST to messages endpoint
-                        message_json = json.dumps(message.message.dict())
-
-                        # Build absolute URL for messages endpoint from the original SSE URL origin
-                        import urllib.parse
-                        origin = urllib.parse.urlsplit(url)
-                        base_origin = f"{origin.scheme}://{origin.netloc}"
-                        # messages_url is expected to start with '/messages/...'
-                        full_url = urllib.parse.urljoin(base_origin, messages_url)
-                        # Ensure timeout param is present for long polling
-                        parsed = urllib.parse.urlsplit(full_url)
-                        q = (parsed.query + "&" if parsed.query else "") + "timeout=30"
-                        full_url = urllib.parse.urlunsplit((parsed.scheme, parsed.netloc, parsed.path, q, parsed.fragment))
-
-                        # Send POST request to messages endpoint with longer timeout
-                        response = await client.post(
-                            full_url,
-                            content=message_json,
-                            headers={"Content-Type": "application/json"},
-                            timeout=30.0  # Increase timeout to prevent premature connection closure
-                        )
-
-                        if response.status_code != 202:  # 202 Accepted is expected
-                            logger.warning("Message POST failed: %s - %s", response.status_code, response.text)
-                        else:
-                            logger.info("Message sent to %s (status=%s)", full_url, response.status_code)
-                except Exception as e:
-                    logger.error("Message sender error: %s", e)
-
-            # Start message sender in background
-            sender_task = asyncio.create_task(message_sender())
-
-            # Create session with the proper streams
-            sess = ClientSession(client_from_server_stream, client_to_server_stream)
-            await sess.initialize()
-            logger.info("MCP SSE session established: %s", url)
-
-            # Store session and cleanup tasks
-            _SESSIONS[url] = sess
-            _ACMS[url] = {
-                'client': client,
-                'event_task': event_task,
-                'sender_task': sender_task
-            }
-
-            return sess
-
+            resources = await started
+        except asyncio.CancelledError:
+            owner.cancel()
+            raise
         except Exception as e:
+            # The owner closes whatever it opened; let it finish before the next attempt
+            await owner
             last_err = e
             logger.warning("SSE connect failed (%s), retrying in %.1fs", e, d)
             await asyncio.sleep(d)
+            continue
+        resources["owner"] = owner
+        resources["stop"] = stop
+        _SESSIONS[url] = resources["session"]
+        _ACMS[url] = resources
+        return resources["session"], resources["batch"]
     raise RuntimeError(f"Failed to connect to MCP SSE at {url}: {last_err}")
 
 
+async def _own_session(url: str, started: asyncio.Future, stop: asyncio.Event) -> None:
+    """Open one SSE session, hand it to started, and tear it down once stop is set.
+
+    anyio only lets a ClientSession be exited from the task that entered it, so its whole
+    lifetime, including cleanup after a failed connect, runs in this one task.
+    """
+    event_task = sender_task = None
+    sess = None
+    try:
+        logger.debug("Connecting SSE to %s", url)
+        from httpx_sse import aconnect_sse
+        from mcp.types import JSONRPCMessage
+        from mcp.shared.message import SessionMessage
+        import anyio
+
+        client, event_client = _http_clients()
+
+        # Create proper duplex streams for ClientSession. Inbound is unbuffered so the SSE reader
+        # waits for the session instead of piling up parsed messages; outbound keeps a few
+        # slots so concurrent calls can queue while a POST is in flight
+        server_to_client_stream, client_from_server_stream = anyio.create_memory_object_stream(0)
+        client_to_server_stream, server_from_client_stream = anyio.create_memory_object_stream(_OUTBOUND_BUFFER)
+
+        # We'll obtain the messages endpoint from the SAME SSE connection we keep open
+        messages_url: Optional[str] = None
+        messages_ready = asyncio.Event()
+        # Batch POSTs bypass the session: their responses are matched here by id
+        batch: Dict[str, Any] = {"outbound": client_to_server_stream, "pending": {}, "supported": None}
+
+        # Long-lived event processing task (single persistent SSE connection)
+        async def process_events():
+            """Continuously read SSE events and forward to client"""
+            try:
+                async with aconnect_sse(event_client, "GET", url) as event_source:
+                    logger.info("SSE event processing started: %s", url)
+                    async for event in event_source.aiter_sse():
+                        # Per-event logging is DEBUG only; the preview is never built otherwise
+                        if logger.isEnabledFor(logging.DEBUG):
+                            preview = (event.data[:200] + "...") if (event.data and len(event.data) > 200) else event.data
+                            logger.debug("SSE event: %s data: %s", event.event, preview)
+                        # The first event should provide the messages endpoint for this session
+                        if event.event == 'endpoint' and event.data:
+                            nonlocal messages_url
+                            messages_url = event.data.strip()
+                            logger.info("Messages endpoint: %s", messages_url)
+                            messages_ready.set()
+                            continue
+                        # Forward any non-endpoint event with JSON payload as JSON-RPC
+                        if event.data and event.event != 'endpoint':
+                            try:
+                                # Parse SSE data as JSON-RPC message(s) and wrap in SessionMessage
+                                data = _json.loads(event.data)
+                                for item in (data if isinstance(data, list) else (data,)):
+                                    if _resolve_batch_reply(batch["pending"], item):
+                                        continue
+                                    jsonrpc_message = JSONRPCMessage(**item)
+                                    message = SessionMessage(message=jsonrpc_message)
+                                    await server_to_client_stream.send(message)
+                            except Exception as e:
+                                logger.warning("Failed to parse SSE event: %s", e)
+            except Exception as e:
+                logger.error("SSE event processing failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+                for fut in batch["pending"].values():
+                    if not fut.done():
+                        fut.set_exception(RuntimeError(f"SSE stream closed: {e}"))
+                # Try to send error through the stream if still open
+                try:
+                    error_msg = SessionMessage(message=JSONRPCMessage(
+                        jsonrpc="2.0",
+                        error={"code": -32000, "message": str(e)},
+                        id=None
+                    ))
+                    await server_to_client_stream.send(error_msg)
+                except Exception as stream_err:
+                    logger.debug("Could not send error through closed stream: %s", stream_err)
+
+        # Start event processing in background (discovers messages_url and handles responses)
+        event_task = asyncio.create_task(process_events())
+
+        # Discovery rides on the one long-lived SSE stream; wait for it here so a failed
+        # connect goes through the retry loop instead of leaving initialize() blocked
+        ready_task = asyncio.create_task(messages_ready.wait())
+        await asyncio.wait({ready_task, event_task}, timeout=_ENDPOINT_TIMEOUT, return_when=asyncio.FIRST_COMPLETED)
+        if not messages_ready.is_set():
+            ready_task.cancel()
+            raise RuntimeError("SSE endpoint event not received")
+
+        async def message_sender():
+            """Send messages from client to server via HTTP POST"""
+            try:
+                # Wait until the messages endpoint is known for this SSE session
+                await messages_ready.wait()
+                assert messages_url is not None
+                # The POST URL only changes if the server announces a new endpoint
+                endpoint = messages_url
+                full_url = _post_url(url, endpoint)
+                async for message in server_from_client_stream:
+                    if messages_url != endpoint:
+                        endpoint = messages_url
+                        full_url = _post_url(url, endpoint)
+
+                    if isinstance(message, _RawPost):
+                        # Pre-serialized batch: queued behind the session's own messages so it
+                        # never overtakes 'initialized'; the caller handles the status
+                        try:
+                            response = await client.post(full_url, content=message.body, headers=_JSON_HEADERS, timeout=30.0)
+                            message.status.set_result(response.status_code)
+                        except Exception as e:
+                            message.status.set_exception(e)
+                        continue
+
+                    # Convert message to JSON and POST to messages endpoint
+                    body = _dump_message(message.message)
+
+                    # Send POST request to messages endpoint with longer timeout
+                    response = await client.post(
+                        full_url,
+                        content=body,
+                        headers=_JSON_HEADERS,
+                        timeout=30.0  # Increase timeout to prevent premature connection closure
+                    )
+
+                    if response.status_code != 202:  # 202 Accepted is expected
+                        logger.warning("Message POST failed: %s - %s", response.status_code, response.text)
+                    else:
+                        logger.debug("Message sent to %s (status=%s)", full_url, response.status_code)
+            except Exception as e:
+                logger.error("Message sender error: %s", e)
+
+        # Start message sender in background
+        sender_task = asyncio.create_task(message_sender())
+
+        # Create session with the proper streams
+        candidate = ClientSession(client_from_server_stream, client_to_server_stream)
+        # Entering the session starts its receive loop, which keeps running on the background loop
+        await candidate.__aenter__()
+        sess = candidate
+        await asyncio.wait_for(sess.initialize(), _ENDPOINT_TIMEOUT)
+        logger.info("MCP SSE session established: %s", url)
+
+        if started.done():  # the connect was cancelled while we were initializing
+            return
+        started.set_result({
+            'session': sess,
+            'batch': batch,
+            'event_task': event_task,
+            'sender_task': sender_task
+        })
+        await stop.wait()
+    except Exception as e:
+        if not started.done():
+            started.set_exception(e)
+    finally:
+        for task in (event_task, sender_task):
+            if task is not None:
+                task.cancel()
+        if sess is not None:
+            try:
+                await sess.__aexit__(None, None, None)
+            except Exception as e:
+                logger.debug("SSE session teardown for %s failed: %s", url, e)
+
+
 async def list_tools_async(server_url: Optional[str] = None) -> Dict[str, Any]:
     logger.debug("list_tools (sse) url=%s", server_url)
-    sess = await _ensure_session(server_url)
+    sess, _ = await _ensure_session(server_url)
     res = await sess.list_tools()
     return {"tools": [t.name for t in res.tools]}
 
 
-async def call_tool_async(name: str, arguments: Dict[str, Any] | None = None, server_url: Optional[str] = None) -> Dict[str, Any]:
-    logger.debug("call_tool sse name=%s args=%s url=%s", name, arguments, server_url)
-    sess = await _ensure_session(server_url)
-    res = await sess.call_tool(name=name, arguments=arguments or {})
+def _tool_result_to_dict(res: Any) -> Dict[str, Any]:
     out: Dict[str, Any] = {"is_error": bool(res.isError)}
-    if res.structuredContent is not None:
-        out["structured"] = res.structuredContent
-    texts = []
-    for block in res.content:
-        text = getattr(block, "text", None)
-        if text:
-            texts.append(text)
+    structured = getattr(res, "structuredContent", None)  # absent on older mcp releases
+    if structured is not None:
+        out["structured"] = structured
+        if _SKIP_TEXT_FLATTEN:
+            return out
+    texts = [t for b in res.content if (t := getattr(b, "text", None))]
     if texts:
         out["text"] = "\n".join(texts)
     return out
 
 
+async def call_tool_async(name: str, arguments: Dict[str, Any] | None = None, server_url: Optional[str] = None) -> Dict[str, Any]:
+    logger.debug("call_tool sse name=%s args=%s url=%s", name, arguments, server_url)
+    sess, _ = await _ensure_session(server_url)
+    res = await sess.call_tool(name=name, arguments=arguments or {})
+    return _tool_result_to_dict(res)
+
+
+def _resolve_batch_reply(pending: Dict[str, asyncio.Future], item: Any) -> bool:
+    if not pending or not isinstance(item, dict):
+        return False
+    fut = pending.pop(item.get("id"), None) if isinstance(item.get("id"), str) else None
+    if fut is None:
+        return False
+    if not fut.done():
+        fut.set_result(item)
+    return True
+
+
+def _batch_reply_to_dict(reply: Dict[str, Any]) -> Dict[str, Any]:
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CallToolResult, ErrorData
+
+    if "error" in reply:
+        # Same failure surface as ClientSession.call_tool
+        raise McpError(ErrorData.model_validate(reply["error"]))
+    return _tool_result_to_dict(CallToolResult.model_validate(reply.get("result") or {}))
+
+
+class _RawPost:
+    """Already-encoded request body for message_sender, with a future for the HTTP status."""
+
+    __slots__ = ("body", "status")
+
+    def __init__(self, body: bytes, status: asyncio.Future) -> None:
+        self.body = body
+        self.status = status
+
+
+async def _call_tools_batch(batch: Dict[str, Any], calls: List[Tuple[str, Dict[str, Any] | None]]) -> Optional[List[Dict[str, Any]]]:
+    """POST all calls as one JSON-RPC batch; None if the server does not accept batches."""
+    loop = asyncio.get_running_loop()
+    ids = [f"batch-{next(_BATCH_IDS)}" for _ in calls]
+    futures = [loop.create_future() for _ in calls]
+    pending = batch["pending"]
+    pending.update(zip(ids, futures))
+    body = _dumps([
+        {"jsonrpc": "2.0", "id": i, "method": "tools/call", "params": {"name": n, "arguments": a or {}}}
+        for i, (n, a) in zip(ids, calls)
+    ])
+    try:
+        status = loop.create_future()
+        await batch["outbound"].send(_RawPost(body, status))
+        code = await status
+        if not 200 <= code < 300:
+            logger.debug("Batch POST rejected: %s", code)
+            return None
+        try:
+            replies = await asyncio.wait_for(asyncio.gather(*futures), _BATCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            missing = sum(i in pending for i in ids)  # answered ids were already popped
+            raise TimeoutError(f"{missing} of {len(calls)} batched tool calls got no reply within {_BATCH_TIMEOUT:g}s") from None
+    finally:
+        for i in ids:
+            pending.pop(i, None)
+    return [_batch_reply_to_dict(r) for r in replies]
+
+
+async def call_tools_async(calls: List[Tuple[str, Dict[str, Any] | None]], server_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Issue several tool calls over one session; results keep the order of calls.
+
+    Multiple calls go out as a single JSON-RPC batch POST when the server accepts it,
+    otherwise as concurrent individual requests.
+    """
+    logger.debug("call_tools sse count=%d url=%s", len(calls), server_url)
+    sess, batch = await _ensure_session(server_url)
+    if len(calls) > 1 and batch["supported"] is not False:
+        results = await _call_tools_batch(batch, calls)
+        if results is not None:
+            batch["supported"] = True
+            return results
+        batch["supported"] = False
+        logger.info("Server does not accept JSON-RPC batches; sending calls individually")
+    results = await asyncio.gather(*(sess.call_tool(name=n, arguments=a or {}) for n, a in calls))
+    return [_tool_result_to_dict(res) for res in results]
+
+
 def call_tool(name: str, arguments: Dict[str, Any] | None = None, server_url: Optional[str] = None) -> Dict[str, Any]:
-    return asyncio.run(call_tool_async(name, arguments, server_url))
+    # The background loop never exits, so _SESSIONS and their connections are reused across calls
+    return run_sync(call_tool_async(name, arguments, server_url))
+
+
+def call_tools(calls: List[Tuple[str, Dict[str, Any] | None]], server_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    return run_sync(call_tools_async(calls, server_url))
@@ -2,67 +2,255 @@ from __future__ import annotations
 
 import asyncio
 import os
+import socket
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from mcp.client.stdio import StdioServerParameters, stdio_client
+import anyio
+from mcp import types
+from mcp.client.stdio import StdioServerParameters, get_default_environment
 from mcp.client.session import ClientSession
-from debug import get_logger
+from mcp.shared.message import SessionMessage
+try:
+    from .debug import get_logger  # type: ignore
+    from .loop_thread import on_shutdown, run_sync  # type: ignore
+except Exception:
+    sys.path.append(str(Path(__file__).resolve().parent))
+    from debug import get_logger  # type: ignore
+    from loop_thread import on_shutdown, run_sync  # type: ignore
 
 
 logger = get_logger("mcp_client_stdio")
 
+# Largest single JSON-RPC line we accept from the server (big tool results/inventories)
+_READ_LIMIT = 16 * 1024 * 1024
+_READ_CHUNK = 64 * 1024
+# Callers that only read "structured" can skip joining the text blocks that mirror it
+_SKIP_TEXT_FLATTEN = os.getenv("MCP_SKIP_TEXT_FLATTEN", "0") == "1"
+# Server script, resolved once. FastMCP stdio servers are launched as scripts;
+# default to orchestrator/combined_mcp_server.py next to this module.
+_SERVER_SCRIPT = Path(os.getenv("MCP_STDIO_SCRIPT") or Path(__file__).resolve().parent / "combined_mcp_server.py").resolve()
+_SERVER_SCRIPT_EXISTS = _SERVER_SCRIPT.exists()
+# Opt-in: start the server with only mcp's platform defaults (PATH, HOME, SYSTEMROOT, TEMP, ...)
+# plus _SERVER_ENV_VARS instead of inheriting the whole environment
+_MINIMAL_SERVER_ENV = os.getenv("MCP_STDIO_MINIMAL_ENV", "0") == "1"
+_SERVER_ENV_VARS = ("PYTHONPATH", "PYTHONUNBUFFERED", "LOG_LEVEL", "LOCAL_MCP_MODULE", "LOCAL_MCP_PORT")
+
 _SESSION: Optional[ClientSession] = None
-_CTX = None  # holds the async context manager object
+_STARTING: Optional[asyncio.Future] = None  # resolves to the session while the server is starting
+_OWNER: Optional[asyncio.Task] = None  # task that holds the transport/session contexts open
+_STOP: Optional[asyncio.Event] = None
+
+
+def _dump_message(message: Any) -> bytes:
+    serializer = getattr(message, "__pydantic_serializer__", None)
+    if serializer is not None:
+        return serializer.to_json(message, by_alias=True, exclude_none=True)
+    return message.json(by_alias=True, exclude_none=True).encode()  # pydantic v1
+
+
+class _BufferedReaderProtocol(asyncio.BufferedProtocol):
+    """Feed a StreamReader from one preallocated receive buffer instead of a bytes object per read."""
+
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        self._reader = reader
+        self._buf = memoryview(bytearray(_READ_CHUNK))
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._reader.set_transport(transport)  # lets the reader pause/resume on its limit
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._buf
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._reader.feed_data(self._buf[:nbytes])
+
+    def eof_received(self) -> bool:
+        self._reader.feed_eof()
+        return False
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if exc is None:
+            self._reader.feed_eof()
+        else:
+            self._reader.set_exception(exc)
+
+
+@asynccontextmanager
+async def _stdio_transport(params: StdioServerParameters) -> AsyncIterator[Tuple[Any, Any]]:
+    """Spawn the server and expose its stdio as ClientSession read/write streams.
+
+    Frames are split with StreamReader.readuntil on the event loop and parsed
+    from bytes, instead of going through a text-decoding stream and str.split.
+    """
+    # Pipe transports only speak data_received, so on POSIX the child's stdout is
+    # one end of a socketpair, whose transport supports BufferedProtocol.
+    parent_sock = child_sock = None
+    if sys.platform != "win32":
+        parent_sock, child_sock = socket.socketpair()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            params.command,
+            *params.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=child_sock if child_sock is not None else asyncio.subprocess.PIPE,
+            env=params.env,
+            cwd=params.cwd,
+            limit=_READ_LIMIT,
+        )
+    except BaseException:
+        if parent_sock is not None:
+            parent_sock.close()
+        raise
+    finally:
+        if child_sock is not None:
+            child_sock.close()
+
+    stdout_transport = None
+    if parent_sock is not None:
+        reader = asyncio.StreamReader(limit=_READ_LIMIT)
+        stdout_transport, _ = await asyncio.get_running_loop().create_connection(
+            lambda: _BufferedReaderProtocol(reader), sock=parent_sock
+        )
+    else:
+        reader = proc.stdout
+    read_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_reader = anyio.create_memory_object_stream(0)
+
+    async def stdout_reader() -> None:
+        try:
+            async with read_writer:
+                while True:
+                    try:
+                        line = await reader.readuntil(b"\n")
+                    except asyncio.IncompleteReadError:
+                        break
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(line)
+                    except Exception as exc:
+                        await read_writer.send(exc)
+                        continue
+                    await read_writer.send(SessionMessage(message))
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async def stdin_writer() -> None:
+        stdin = proc.stdin
+        try:
+            async with write_reader:
+                async for session_message in write_reader:
+                    stdin.write(_dump_message(session_message.message) + b"\n")
+                    await stdin.drain()
+        except (anyio.ClosedResourceError, ConnectionError):
+            await anyio.lowlevel.checkpoint()
+
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(stdout_reader)
+            tg.start_soon(stdin_writer)
+            try:
+                yield read_stream, write_stream
+            finally:
+                await read_stream.aclose()
+                await write_stream.aclose()
+                tg.cancel_scope.cancel()
+    finally:
+        if stdout_transport is not None:
+            stdout_transport.close()
+        if proc.returncode is None:
+            try:
+                proc.terminate()
+                await asyncio.wait_for(proc.wait(), 2.0)
+            except ProcessLookupError:
+                pass
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+
+
+def _server_env() -> Optional[Dict[str, str]]:
+    """Server environment; None inherits ours, which the server's shell/python tools rely on."""
+    if not _MINIMAL_SERVER_ENV:
+        return None
+    env = get_default_environment()
+    for key in _SERVER_ENV_VARS:
+        value = os.environ.get(key)
+        if value is not None:
+            env[key] = value
+    return env
+
+
+async def _own_session(params: StdioServerParameters, ready: asyncio.Future, stop: asyncio.Event) -> None:
+    """Enter and later exit the transport/session contexts from one task, as anyio requires."""
+    try:
+        async with _stdio_transport(params) as (read_stream, write_stream):
+            # The transport yields read/write streams; ClientSession consumes them
+            async with ClientSession(read_stream, write_stream) as sess:
+                logger.debug("Initializing MCP ClientSession (stdio)")
+                await sess.initialize()
+                ready.set_result(sess)
+                await stop.wait()
+    except BaseException as e:
+        if not ready.done():
+            ready.set_exception(e if isinstance(e, Exception) else RuntimeError(str(e)))
+        if not isinstance(e, Exception):
+            raise
+        logger.error("MCP stdio session ended: %s", e)
 
 
 async def _ensure_session(server_script: Optional[str] = None) -> ClientSession:
-    global _SESSION, _CTX
-    if _SESSION is not None:
+    global _SESSION, _STARTING, _OWNER, _STOP
+    if _SESSION is not None and _OWNER is not None and not _OWNER.done():
         return _SESSION
+    if _STARTING is not None:
+        return await asyncio.shield(_STARTING)
 
-    # Determine server command
-    # Prefer module path env (LOCAL_MCP_MODULE) like "orchestrator.combined_mcp_server:app"
-    # but FastMCP stdio servers are typically launched as scripts.
-    script = server_script or os.getenv("MCP_STDIO_SCRIPT")
-    if not script:
-        # default to orchestrator/combined_mcp_server.py under docs
-        here = Path(__file__).resolve().parent
-        candidate = here / "combined_mcp_server.py"
-        script = str(candidate)
-
-    if not Path(script).exists():
+    if server_script:
+        script = Path(server_script).resolve()
+        script_exists = script.exists()
+    else:
+        script, script_exists = _SERVER_SCRIPT, _SERVER_SCRIPT_EXISTS
+    if not script_exists:
         logger.error("MCP stdio server script not found: %s", script)
         raise RuntimeError(f"MCP stdio server script not found: {script}")
 
     params = StdioServerParameters(
         command=sys.executable,
-        args=[script],
-        env=os.environ.copy(),
-        cwd=str(Path(script).resolve().parent),
+        args=[str(script)],
+        env=_server_env(),
+        cwd=str(script.parent),
     )
 
     logger.debug("Starting stdio MCP server: cmd=%s args=%s cwd=%s", params.command, params.args, params.cwd)
-    _CTX = stdio_client(params)
-    cm = _CTX.__aenter__()
-    # stdio_client yields read/write streams; ClientSession consumes them
-    read_stream, write_stream = await cm  # type: ignore[misc]
-    _SESSION = ClientSession(read_stream, write_stream)
-    logger.debug("Initializing MCP ClientSession (stdio)")
-    await _SESSION.initialize()
+    _STARTING = asyncio.get_running_loop().create_future()
+    _STOP = asyncio.Event()
+    _OWNER = asyncio.create_task(_own_session(params, _STARTING, _STOP))
+    try:
+        _SESSION = await asyncio.shield(_STARTING)
+    except Exception:
+        _OWNER = _STOP = None
+        raise
+    finally:
+        _STARTING = None
     logger.info("MCP stdio session established with %s", script)
     return _SESSION
 
 
 async def _shutdown() -> None:
-    global _SESSION, _CTX
-    if _SESSION is not None:
-        # Closing is handled by exiting the stdio_client context
-        _SESSION = None
-    if _CTX is not None:
-        await _CTX.__aexit__(None, None, None)  # type: ignore[misc]
-        _CTX = None
+    global _SESSION, _OWNER, _STOP
+    # Closing is handled by the owner task exiting the transport context
+    _SESSION = None
+    if _STOP is not None:
+        _STOP.set()
+        _STOP = None
+    if _OWNER is not None:
+        await _OWNER
+        _OWNER = None
+
+
+on_shutdown(_shutdown)
 
 
 async def list_tools() -> Dict[str, Any]:
@@ -79,20 +267,33 @@ async def call_tool_async(name: str, arguments: Dict[str, Any] | None = None) ->
     # Convert CallToolResult to dict
     out: Dict[str, Any] = {"is_error": bool(res.isError)}
     # structuredContent if provided
-    if res.structuredContent is not None:
-        out["structured"] = res.structuredContent
-    # Flatten content blocks (text only if present)
-    texts = []
-    for block in res.content:
-        # ContentBlock may have 'type' and 'text'
-        text = getattr(block, "text", None)
-        if text:
-            texts.append(text)
+    structured = getattr(res, "structuredContent", None)
+    if structured is not None:
+        out["structured"] = structured
+        if _SKIP_TEXT_FLATTEN:
+            return out
+    # Flatten content blocks (text only if present); ContentBlock may have 'type' and 'text'
+    texts = [t for b in res.content if (t := getattr(b, "text", None))]
     if texts:
         out["text"] = "\n".join(texts)
     return out
 
 
+async def call_tools_async(calls: List[Tuple[str, Dict[str, Any] | None]]) -> List[Dict[str, Any]]:
+    """Issue several tool calls concurrently on the shared session; results keep the order of calls."""
+    logger.debug("call_tools stdio count=%d", len(calls))
+    await _ensure_session()
+    return list(await asyncio.gather(*(call_tool_async(n, a) for n, a in calls)))
+
+
 def call_tool(name: str, arguments: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    """Synchronous wrapper to call a tool over stdio MCP."""
-    return asyncio.run(call_tool_async(name, arguments))
+    """Synchronous wrapper to call a tool over stdio MCP.
+
+    Runs on the shared background loop, so the server subprocess and session are
+    started once and reused by every later call.
+    """
+    return run_sync(call_tool_async(name, arguments))
+
+
+def call_tools(calls: List[Tuple[str, Dict[str, Any] | None]]) -> List[Dict[str, Any]]:
+    return run_sync(call_tools_async(calls))
@@ -1,14 +1,9 @@
 from __future__ import annotations
 
-import asyncio
 import os
 import sys
 from pathlib import Path
 
-# Force SelectorEventLoopPolicy on Windows to avoid IocpProactor deadlock
-if sys.platform.startswith("win"):
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-
 
 DOCS_DIR = Path(__file__).resolve().parent
 
@@ -24,6 +19,7 @@ os.environ.setdefault("PYTHONUNBUFFERED", "1")
 
 # Import mcp_client_stdio directly since we're in the orchestrator directory
 import mcp_client_stdio as c
+from loop_thread import run_sync
 
 
 async def main() -> None:
@@ -37,4 +33,6 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Run on the client's own background loop (the default Proactor loop on
+    # Windows), so the subprocess and session are owned by a single loop.
+    run_sync(main())
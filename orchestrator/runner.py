@@ -1,23 +1,32 @@
 ﻿from __future__ import annotations
 
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import json
 from pathlib import Path
 import os
-from typing import Any, Dict
+import sys
+import time
+from typing import Any, Callable, Dict
 
 from jsonschema import Draft202012Validator
+from jsonschema.exceptions import SchemaError
+try:
+    import orjson as _orjson
+except ImportError:  # optional speedup
+    _orjson = None
 from .debug import get_logger
 
 try:
-    from .envelope_validator import validate_envelope  # type: ignore
-    from .tools_stub import execute_envelope_tool  # type: ignore
+    from .envelope_validator import collect_errors, validate_envelope  # type: ignore
+    from .tools_stub import USE_OPENAI_MCP, execute_envelope_tool, execute_envelope_tools  # type: ignore
     from .decide_next import decide_next  # type: ignore
     from .local_mcp_launcher import LocalMCPServer, url_is_local, url_reachable  # type: ignore
 except Exception:
     import sys as _sys
     _sys.path.append(str(Path(__file__).resolve().parent))
-    from envelope_validator import validate_envelope  # type: ignore
-    from tools_stub import execute_envelope_tool  # type: ignore
+    from envelope_validator import collect_errors, validate_envelope  # type: ignore
+    from tools_stub import USE_OPENAI_MCP, execute_envelope_tool, execute_envelope_tools  # type: ignore
     from decide_next import decide_next  # type: ignore
     from local_mcp_launcher import LocalMCPServer, url_is_local, url_reachable  # type: ignore
 
@@ -26,14 +35,22 @@ ROOT = Path(__file__).resolve().parent.parent   # docs
 HERE = Path(__file__).resolve().parent          # docs/orchestrator
 WORKSPACE_PATH = ROOT / os.getenv("AGENT_WORKSPACE", "agent_workspace.autonomous.gpt5.json")
 ENVELOPE_SCHEMA_PATH = ROOT / "envelope.schema.json"
+RUNS_PATH = ROOT / "runs.jsonl"
 MCP_SERVERS_CFG_CANDIDATES = [
     HERE / "mcpServers.json",
     ROOT / "mcpServers.json",
     ROOT.parent / "mcpServers.json",
 ]
+# First candidate that exists, resolved once at import
+MCP_SERVERS_CFG_PATH = next((p for p in MCP_SERVERS_CFG_CANDIDATES if p.exists()), None)
 
 
 def load_json(path: Path) -> Any:
+    if _orjson is not None:
+        try:
+            return _orjson.loads(path.read_bytes())
+        except _orjson.JSONDecodeError:
+            pass  # e.g. a UTF-8 BOM; fall through to the decode chain below
     try:
         return json.loads(path.read_text(encoding="utf-8"))
     except Exception:
@@ -46,16 +63,49 @@ def load_json(path: Path) -> Any:
     return json.loads(text)
 
 
+# Compiled once at import; compilation is most of jsonschema's cost, not validation.
+# A missing or broken schema leaves this None so the error surfaces from validate_envelope
+# at run time rather than from importing this module
+try:
+    _VALIDATOR: Draft202012Validator | None = Draft202012Validator(load_json(ENVELOPE_SCHEMA_PATH), format_checker=None)
+except (OSError, ValueError, SchemaError):
+    _VALIDATOR = None
+
+
+def validate_envelope_cached(envelope: Dict[str, Any]) -> tuple[bool, list[str]]:
+    if _VALIDATOR is None:
+        return validate_envelope(envelope, ENVELOPE_SCHEMA_PATH)
+    return collect_errors(_VALIDATOR, envelope)
+
+
+# Parallel plan steps on the sync-only OpenAI MCP path run on threads; the
+# stdio/SSE transports batch on their own event loop instead (execute_envelope_tools)
+_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+_TOOL_POOL = ThreadPoolExecutor(max_workers=min(32, _CPUS * 4), thread_name_prefix="tool")
+
+
+def _execute_tool_call(call: tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return execute_envelope_tool(*call)
+
+
+def persist_run(rec: Dict[str, Any]) -> None:
+    """Append a run record to runs.jsonl; a failed write is logged rather than raised."""
+    if _orjson is not None:
+        line = _orjson.dumps(rec, default=str) + b"\n"
+    else:
+        line = (json.dumps(rec, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+    try:
+        with RUNS_PATH.open("ab") as f:
+            f.write(line)
+    except OSError:
+        get_logger("runner").exception("Could not append run record to %s", RUNS_PATH)
+
+
 def _resolve_server() -> tuple[str | None, str | None]:
+    if MCP_SERVERS_CFG_PATH is None:
+        return (None, None)
     try:
-        cfg = None
-        for c in MCP_SERVERS_CFG_CANDIDATES:
-            if c.exists():
-                cfg = c
-                break
-        if not cfg:
-            return (None, None)
-        data = load_json(cfg)
+        data = load_json(MCP_SERVERS_CFG_PATH)
         servers = data.get("servers", [])
         default_label = data.get("default_label")
         if default_label:
@@ -70,72 +120,118 @@ def _resolve_server() -> tuple[str | None, str | None]:
     return (None, None)
 
 
-def run_one_cycle(context: Dict[str, Any]) -> Dict[str, Any]:
-    logger = get_logger("runner")
-    envelope = context.get("envelope")
-    ok, errs = validate_envelope(envelope, ENVELOPE_SCHEMA_PATH)
-    if not ok:
-        logger.warning("Invalid envelope: %s", errs)
-        return {**context, "error": {"kind": "invalid_envelope", "details": errs}}
-
-    etype = envelope.get("state") or envelope.get("type")  # Support both schema formats
-    if etype == "tool":
-        tool = envelope.get("tool")
-        args = envelope.get("arguments", {})
-
-        # Validate tool name
-        if not tool or tool == "unknown":
-            logger.error("Invalid tool name in envelope: %s", tool)
-            return {**context, "error": {"kind": "invalid_tool_name", "tool": tool, "message": "Tool name is missing or invalid"}}
-
-        logger.debug("Executing tool: %s args=%s", tool, args)
-        import time as _time
-        _t0 = _time.perf_counter()
-        obs = execute_envelope_tool(tool, args)
-        _t1 = _time.perf_counter()
-        logger.debug("Tool %s completed in %.1f ms", tool, (_t1 - _t0) * 1000)
-        # Simple approval gating: if tool execution signals approval_required
-        if isinstance(obs, dict) and (obs.get("approval_required") or obs.get("error") == "approval_required"):
-            logger.info("Tool %s requires approval: %s", tool, obs)
-            context.setdefault("history", []).append({"type": "approval_request", "reason": obs.get("reason", "high-risk tool")})
-            context["status"] = "waiting"
-            return context
-        context["last_observation"] = obs
-        context.setdefault("history", []).append({"type": "tool_call", "tool": tool, "args": args, "obs": obs})
-        return context
-    if etype == "message":
-        # Handle both envelope formats
-        message_content = envelope.get("message", "")
-        if not message_content and "conversation" in envelope:
-            message_content = envelope["conversation"].get("utterance", "")
-        context.setdefault("history", []).append({"type": "message", "role": "assistant", "content": message_content})
-        return context
-    if etype == "plan":
-        # Extract plan object from envelope (schema-compliant)
-        plan_obj = envelope.get("plan", {})
-        context["plan"] = plan_obj
+def _handle_tool(context: Dict[str, Any], envelope: Dict[str, Any], logger: Any) -> Dict[str, Any]:
+    tool = envelope.get("tool")
+    args = envelope.get("arguments", {})
 
-        # Persist the goal if not already set
-        if plan_obj.get("root_task") and not context.get("goal"):
-            context["goal"] = plan_obj["root_task"]
+    # Validate tool name
+    if not tool or tool == "unknown":
+        logger.error("Invalid tool name in envelope: %s", tool)
+        return {**context, "error": {"kind": "invalid_tool_name", "tool": tool, "message": "Tool name is missing or invalid"}}
 
-        context.setdefault("history", []).append({"type": "message", "role": "system", "content": "Plan recorded."})
-        return context
-    if etype == "ask_human":
-        context.setdefault("history", []).append({"type": "approval_request", "reason": envelope.get("reason"), "fields": envelope.get("fields", [])})
-        context["status"] = "waiting"
-        return context
-    if etype == "wait":
-        context.setdefault("history", []).append({"type": "event", "waiting_for": envelope.get("event_type") or f"duration_ms={envelope.get('duration_ms')}"})
+    logger.debug("Executing tool: %s args=%s", tool, args)
+    _t0 = time.perf_counter()
+    obs = execute_envelope_tool(tool, args)
+    _t1 = time.perf_counter()
+    logger.debug("Tool %s completed in %.1f ms", tool, (_t1 - _t0) * 1000)
+    # Simple approval gating: if tool execution signals approval_required
+    if isinstance(obs, dict) and (obs.get("approval_required") or obs.get("error") == "approval_required"):
+        logger.info("Tool %s requires approval: %s", tool, obs)
+        context["history"].append({"type": "approval_request", "reason": obs.get("reason", "high-risk tool")})
         context["status"] = "waiting"
         return context
-    if etype == "finish":
-        context.setdefault("history", []).append({"type": "transition", "to": "completed"})
-        context["status"] = "completed"
-        context["result"] = envelope.get("result")
+    context["last_observation"] = obs
+    context["history"].append({"type": "tool_call", "tool": tool, "args": args, "obs": obs})
+    return context
+
+
+def _handle_message(context: Dict[str, Any], envelope: Dict[str, Any], logger: Any) -> Dict[str, Any]:
+    # Handle both envelope formats
+    message_content = envelope.get("message", "")
+    if not message_content and "conversation" in envelope:
+        message_content = envelope["conversation"].get("utterance", "")
+    context["history"].append({"type": "message", "role": "assistant", "content": message_content})
+    return context
+
+
+def _handle_plan(context: Dict[str, Any], envelope: Dict[str, Any], logger: Any) -> Dict[str, Any]:
+    # Extract plan object from envelope (schema-compliant)
+    plan_obj = envelope.get("plan", {})
+    context["plan"] = plan_obj
+
+    # Persist the goal if not already set
+    if plan_obj.get("root_task") and not context.get("goal"):
+        context["goal"] = plan_obj["root_task"]
+
+    history = context["history"]
+    # Parallel plans whose steps are already concrete tool calls run as one batch
+    tool_steps = [st for st in plan_obj.get("steps", []) if isinstance(st, dict) and st.get("tool")]
+    if plan_obj.get("execution_mode") == "parallel" and len(tool_steps) > 1:
+        calls = [(st["tool"], st.get("arguments") or {}) for st in tool_steps]
+        logger.debug("Executing %d plan steps as a batch", len(calls))
+        if USE_OPENAI_MCP:
+            observations = list(_TOOL_POOL.map(_execute_tool_call, calls))
+        else:
+            observations = execute_envelope_tools(calls)
+        for (tool, args), obs in zip(calls, observations):
+            history.append({"type": "tool_call", "tool": tool, "args": args, "obs": obs})
+        context["last_observation"] = observations[-1]
+        if any(isinstance(obs, dict) and obs.get("approval_required") for obs in observations):
+            history.append({"type": "approval_request", "reason": "high-risk tool in plan"})
+            context["status"] = "waiting"
         return context
 
-    return {**context, "error": {"kind": "unknown_envelope_type", "value": etype}}
+    history.append({"type": "message", "role": "system", "content": "Plan recorded."})
+    return context
+
+
+def _handle_ask(context: Dict[str, Any], envelope: Dict[str, Any], logger: Any) -> Dict[str, Any]:
+    context["history"].append({"type": "approval_request", "reason": envelope.get("reason"), "fields": envelope.get("fields", [])})
+    context["status"] = "waiting"
+    return context
+
+
+def _handle_wait(context: Dict[str, Any], envelope: Dict[str, Any], logger: Any) -> Dict[str, Any]:
+    context["history"].append({"type": "event", "waiting_for": envelope.get("event_type") or f"duration_ms={envelope.get('duration_ms')}"})
+    context["status"] = "waiting"
+    return context
+
+
+def _handle_finish(context: Dict[str, Any], envelope: Dict[str, Any], logger: Any) -> Dict[str, Any]:
+    context["history"].append({"type": "transition", "to": "completed"})
+    context["status"] = "completed"
+    context["result"] = envelope.get("result")
+    return context
+
+
+_HANDLERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any], Any], Dict[str, Any]]] = {
+    "tool": _handle_tool,
+    "message": _handle_message,
+    "plan": _handle_plan,
+    "ask_human": _handle_ask,
+    "wait": _handle_wait,
+    "finish": _handle_finish,
+}
+
+
+def run_one_cycle(context: Dict[str, Any]) -> Dict[str, Any]:
+    logger = get_logger("runner")
+    envelope = context.get("envelope")
+    # decide_next marks envelopes it already validated against the schema
+    if not getattr(envelope, "validated", False):
+        ok, errs = validate_envelope_cached(envelope)
+        if not ok:
+            logger.warning("Invalid envelope: %s", errs)
+            return {**context, "error": {"kind": "invalid_envelope", "details": errs}}
+
+    etype = envelope.get("state") or envelope.get("type")  # Support both schema formats
+    handler = _HANDLERS.get(etype) if isinstance(etype, str) else None
+    if handler is None:
+        return {**context, "error": {"kind": "unknown_envelope_type", "value": etype}}
+    # Handlers append to context["history"]; make sure it exists once here
+    if context.get("history") is None:
+        context["history"] = []
+    return handler(context, envelope, logger)
 
 
 if __name__ == "__main__":
@@ -169,14 +265,16 @@ if __name__ == "__main__":
     except Exception:
         pass
 
-    ctx: Dict[str, Any] = {"goal": os.getenv("GOAL", "Demo"), "history": [], "mcp_servers": {}}
+    # Bounded so long runs keep only the most recent events
+    history: collections.deque = collections.deque(maxlen=int(os.getenv("HISTORY_MAX", "1000")))
+    ctx: Dict[str, Any] = {"goal": os.getenv("GOAL", "Demo"), "history": history, "mcp_servers": {}}
     max_cycles = int(os.getenv("MAX_CYCLES", "6"))
     for i in range(max_cycles):
         logger.debug("Cycle %d starting", i + 1)
         ok, out = decide_next(ctx, ws, ENVELOPE_SCHEMA_PATH)
         if not ok:
             logger.error("decide_next failed: %s", out)
-            ctx.setdefault("history", []).append({"type": "error", "data": out})
+            ctx["history"].append({"type": "error", "data": out})
             break
         ctx["envelope"] = out  # type: ignore[assignment]
         logger.debug("Envelope decided: %s", out)
@@ -189,19 +287,24 @@ if __name__ == "__main__":
             logger.info("Run waiting for approval or event")
             break
 
-    print(json.dumps({k: v for k, v in ctx.items() if k != 'history'}, indent=2))
+    summary = {k: v for k, v in ctx.items() if k != 'history'}
+    if _orjson is not None:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_orjson.dumps(summary, option=_orjson.OPT_INDENT_2, default=str) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     print("History events:")
-    for h in ctx.get("history", []):
-        print(" -", h)
+    sys.stdout.writelines(f" - {h}\n" for h in ctx.get("history", []))
 
     # Persist run record for observability
     try:
-        out_path = ROOT / "runs.jsonl"
-        rec = {k: v for k, v in ctx.items() if k in ("goal", "status", "result", "history")}
-        with out_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        rec = {k: v for k, v in ctx.items() if k in ("goal", "status", "result")}
+        rec["history"] = list(ctx.get("history", ()))
+        persist_run(rec)
     except Exception:
-        pass
+        logger.exception("Could not record run")
 
     # No persistent server lifecycle mgmt here; add stop if we started it and persisted handle
 
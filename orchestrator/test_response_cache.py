@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test the MCP response cache used by the direct and OpenAI clients
+"""
+
+import time
+
+from response_cache import ResponseCache
+
+
+def test_lru_eviction():
+    """Oldest untouched entry is dropped once maxsize is exceeded"""
+    cache = ResponseCache(2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")  # a becomes most recently used
+    cache.put("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL are treated as misses"""
+    cache = ResponseCache(4, ttl=0.05)
+    cache.put("q", {"results": []})
+    assert cache.get("q") == {"results": []}
+
+    time.sleep(0.1)
+    assert cache.get("q") is None
+
+
+def test_error_results_not_cached():
+    """Error responses pass through but are never stored"""
+    cache = ResponseCache(4)
+    err = {"error": "HTTP 500"}
+    assert cache.put("x", err) is err
+    assert cache.get("x") is None
+
+
+def test_callers_cannot_mutate_cached_value():
+    """Mutating a returned response leaves the cached entry untouched"""
+    cache = ResponseCache(4)
+    original = {"id": "1", "text": "body"}
+    cache.put("doc", original)
+    original["annotated"] = True
+
+    hit = cache.get("doc")
+    hit["seen"] = True
+    assert cache.get("doc") == {"id": "1", "text": "body"}
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_ttl_expiry()
+    test_error_results_not_cached()
+    test_callers_cannot_mutate_cached_value()
+    print("SUCCESS: response cache tests passed")
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import functools
+import importlib
 import json
-from typing import Any, Dict
+import logging
+from typing import Any, Callable, Dict
 import os
+import sys
 from pathlib import Path
-import json
+try:
+    import orjson as _orjson
+except ImportError:  # optional speedup
+    _orjson = None
 
 try:
     # Prefer local logger (avoids relative import issues when launched differently)
@@ -17,234 +24,280 @@ except Exception:
 
 logger = get_logger("tools_stub")
 
-USE_OPENAI_MCP = os.getenv("USE_OPENAI_MCP", "0") == "1"
-USE_DIRECT_MCP = os.getenv("USE_DIRECT_MCP", "0") == "1"
-USE_MCP_STDIO = os.getenv("USE_MCP_STDIO", "0") == "1"
-USE_MCP_SSE = os.getenv("USE_MCP_SSE", "0") == "1"
-if USE_OPENAI_MCP:
-    try:
-        from . import mcp_client_openai  # type: ignore
-    except Exception:
-        import sys as _sys
-        from pathlib import Path as _Path
-        _sys.path.append(str(_Path(__file__).resolve().parent))
-        import mcp_client_openai  # type: ignore
-elif USE_DIRECT_MCP:
-    try:
-        from . import mcp_client_direct  # type: ignore
-    except Exception:
-        import sys as _sys
-        from pathlib import Path as _Path
-        _sys.path.append(str(_Path(__file__).resolve().parent))
-        import mcp_client_direct  # type: ignore
-elif USE_MCP_STDIO:
-    try:
-        from . import mcp_client_stdio  # type: ignore
-    except Exception:
-        import sys as _sys
-        from pathlib import Path as _Path
-        _sys.path.append(str(_Path(__file__).resolve().parent))
-        import mcp_client_stdio  # type: ignore
-elif USE_MCP_SSE:
+# (env flag, transport name, client module); the first flag set to "1" wins
+_TRANSPORTS = (
+    ("USE_OPENAI_MCP", "OPENAI_MCP", "mcp_client_openai"),
+    ("USE_DIRECT_MCP", "DIRECT", "mcp_client_direct"),
+    ("USE_MCP_STDIO", "STDIO", "mcp_client_stdio"),
+    ("USE_MCP_SSE", "SSE", "mcp_client_sse"),
+)
+for _flag, _TRANSPORT, _CLIENT_MODULE in _TRANSPORTS:
+    if os.environ.get(_flag) == "1":
+        break
+else:
+    raise RuntimeError("No MCP client selected. Set USE_DIRECT_MCP=1, USE_OPENAI_MCP=1, USE_MCP_STDIO=1, or USE_MCP_SSE=1.")
+
+USE_OPENAI_MCP = _TRANSPORT == "OPENAI_MCP"
+USE_DIRECT_MCP = _TRANSPORT == "DIRECT"
+USE_MCP_STDIO = _TRANSPORT == "STDIO"
+USE_MCP_SSE = _TRANSPORT == "SSE"
+
+
+@functools.cache
+def _get_client():
+    """Import the selected MCP client on first use; mcp/httpx/openai stay unloaded until then."""
     try:
-        from . import mcp_client_sse  # type: ignore
+        return importlib.import_module(f"{__package__}.{_CLIENT_MODULE}" if __package__ else _CLIENT_MODULE)
     except Exception:
         import sys as _sys
         from pathlib import Path as _Path
         _sys.path.append(str(_Path(__file__).resolve().parent))
-        import mcp_client_sse  # type: ignore
-else:
-    raise RuntimeError("No MCP client selected. Set USE_DIRECT_MCP=1, USE_OPENAI_MCP=1, USE_MCP_STDIO=1, or USE_MCP_SSE=1.")
+        return importlib.import_module(_CLIENT_MODULE)
+
 
 # Log selected transport once at import
-try:
-    transport = (
-        "OPENAI_MCP" if USE_OPENAI_MCP else
-        "DIRECT" if USE_DIRECT_MCP else
-        "STDIO" if USE_MCP_STDIO else
-        "SSE" if USE_MCP_SSE else
-        "(none)"
-    )
-    logger.info("MCP transport selected: %s", transport)
-except Exception:
-    pass
+logger.info("MCP transport selected: %s", _TRANSPORT)
+
+
+def _openai_server(server_label: str | None, server_url: str | None) -> tuple[str, str]:
+    if not server_label or not server_url:
+        server_label, server_url = _resolve_server()
+    if not (server_label and server_url):
+        raise RuntimeError("MCP server not configured. Provide server_label/server_url or configure docs/mcpServers.json.")
+    return server_label, server_url
+
+
+def _direct_url(server_url: str | None) -> str:
+    if not server_url:
+        _, server_url = _resolve_server()
+    if not server_url:
+        raise RuntimeError("MCP server URL not configured. Provide server_url or configure docs/mcpServers.json.")
+    return server_url
+
+
+def _default_server_url() -> str | None:
+    """First configured server URL, precomputed with the parsed config."""
+    return _servers_snapshot()[2]
+
+
+# Transport-specific search/fetch/call, bound once here instead of re-deciding per call.
+# stdio/SSE servers expose search and fetch as tools addressed by name.
+_SEARCH = {
+    "OPENAI_MCP": lambda query, label, url: _get_client().search(*_openai_server(label, url), query),
+    "DIRECT": lambda query, label, url: _get_client().search(_direct_url(url), query),
+    "STDIO": lambda query, label, url: _get_client().call_tool("search", {"query": query}),
+    "SSE": lambda query, label, url: _get_client().call_tool("search", {"query": query}, server_url=url),
+}[_TRANSPORT]
+_FETCH = {
+    "OPENAI_MCP": lambda id, label, url: _get_client().fetch(*_openai_server(label, url), id),
+    "DIRECT": lambda id, label, url: _get_client().fetch(_direct_url(url), id),
+    "STDIO": lambda id, label, url: _get_client().call_tool("fetch", {"id": id}),
+    "SSE": lambda id, label, url: _get_client().call_tool("fetch", {"id": id}, server_url=url),
+}[_TRANSPORT]
+# Generic call of any tool by name; the OpenAI path only supports search/fetch
+_CALL = {
+    "OPENAI_MCP": None,
+    "DIRECT": lambda tool, arguments: _get_client().call_tool(tool, arguments),
+    "STDIO": lambda tool, arguments: _get_client().call_tool(tool, arguments),
+    "SSE": lambda tool, arguments: _get_client().call_tool(tool, arguments, server_url=_default_server_url()),
+}[_TRANSPORT]
 
 
 def mcp_search(query: str, server_label: str | None = None, server_url: str | None = None) -> Dict[str, Any]:
-    logger.debug("mcp_search query=%s label=%s url=%s", query, server_label, server_url)
-    if USE_OPENAI_MCP:
-        if not server_label or not server_url:
-            server_label, server_url = _resolve_server()
-        if not (server_label and server_url):
-            raise RuntimeError("MCP server not configured. Provide server_label/server_url or configure docs/mcpServers.json.")
-        logger.debug("mcp_search via OPENAI_MCP label=%s url=%s", server_label, server_url)
-        return mcp_client_openai.search(server_label, server_url, query)  # type: ignore[name-defined]
-    if USE_DIRECT_MCP:
-        if not server_url:
-            _, server_url = _resolve_server()
-        if not server_url:
-            raise RuntimeError("MCP server URL not configured. Provide server_url or configure docs/mcpServers.json.")
-        logger.debug("mcp_search via DIRECT url=%s", server_url)
-        return mcp_client_direct.search(server_url, query)  # type: ignore[name-defined]
-    if USE_MCP_STDIO:
-        logger.debug("mcp_search via STDIO")
-        # stdio tools are addressed by name, pass query in arguments
-        return mcp_client_stdio.call_tool("search", {"query": query})  # type: ignore[name-defined]
-    if USE_MCP_SSE:
-        logger.debug("mcp_search via SSE url=%s", server_url)
-        return mcp_client_sse.call_tool("search", {"query": query}, server_url=server_url)  # type: ignore[name-defined]
-    # Should never reach here due to guard above
-    raise RuntimeError("MCP client not available.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("mcp_search via %s query=%s label=%s url=%s", _TRANSPORT, query, server_label, server_url)
+    return _SEARCH(query, server_label, server_url)
 
 
 def mcp_fetch(id: str, server_label: str | None = None, server_url: str | None = None) -> Dict[str, Any]:
-    if USE_OPENAI_MCP:
-        if not server_label or not server_url:
-            server_label, server_url = _resolve_server()
-        if not (server_label and server_url):
-            raise RuntimeError("MCP server not configured. Provide server_label/server_url or configure docs/mcpServers.json.")
-        return mcp_client_openai.fetch(server_label, server_url, id)  # type: ignore[name-defined]
-    if USE_DIRECT_MCP:
-        if not server_url:
-            _, server_url = _resolve_server()
-        if not server_url:
-            raise RuntimeError("MCP server URL not configured. Provide server_url or configure docs/mcpServers.json.")
-        return mcp_client_direct.fetch(server_url, id)  # type: ignore[name-defined]
-    if USE_MCP_STDIO:
-        # For stdio servers, expose fetch via tool name
-        return mcp_client_stdio.call_tool("fetch", {"id": id})  # type: ignore[name-defined]
-    if USE_MCP_SSE:
-        return mcp_client_sse.call_tool("fetch", {"id": id}, server_url=server_url)  # type: ignore[name-defined]
-    # Should never reach here due to guard above
-    raise RuntimeError("MCP client not available.")
+    return _FETCH(id, server_label, server_url)
 
 
-def _resolve_server() -> tuple[str | None, str | None]:
-    """Load default MCP server label/url from docs/mcpServers.json if present."""
-    try:
-        root = Path(__file__).resolve().parent.parent  # docs
-        here = Path(__file__).resolve().parent        # docs/orchestrator
-        # Prefer local orchestrator config, then docs/, then project root
-        candidates = [
-            here / "mcpServers.json",
-            root / "mcpServers.json",
-            root.parent / "mcpServers.json",
-        ]
-        cfg_path = None
-        for c in candidates:
-            if c.exists():
-                cfg_path = c
-                break
-        if not cfg_path:
-            return (None, None)
+_HERE = Path(__file__).resolve().parent  # docs/orchestrator
+# Prefer local orchestrator config, then docs/, then project root
+_CONFIG_CANDIDATES = (_HERE / "mcpServers.json", _HERE.parent / "mcpServers.json", _HERE.parent.parent / "mcpServers.json")
+# Candidates that exist, found once at import; edits to them are still seen via mtime
+_CONFIG_PATHS = tuple(p for p in _CONFIG_CANDIDATES if p.exists())
+
+
+def _read_config(cfg_path: Path) -> dict:
+    # One read; strip a UTF-8 BOM ourselves instead of re-reading with utf-8-sig
+    raw = cfg_path.read_bytes()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _current_mtimes() -> tuple[tuple[Path, int], ...]:
+    """(path, mtime_ns) for each config file found at import; the cache key for _cfg_snapshot."""
+    out = []
+    for cfg_path in _CONFIG_PATHS:
+        try:
+            out.append((cfg_path, cfg_path.stat().st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(out)
+
+
+@functools.lru_cache(maxsize=1)
+def _cfg_snapshot(mtimes: tuple[tuple[Path, int], ...]) -> tuple[tuple[str | None, str | None], dict[str, str], str | None]:
+    """Parse the config files once per change: ((default label, url), {label: url}, first url)."""
+    default: tuple[str | None, str | None] = (None, None)
+    servers_map: dict[str, str] = {}
+    for i, (cfg_path, _) in enumerate(mtimes):
         try:
-            data = json.loads(cfg_path.read_text(encoding="utf-8"))
+            data = _read_config(cfg_path)
         except Exception:
-            data = json.loads(cfg_path.read_text(encoding="utf-8-sig"))
+            continue
         servers = data.get("servers", [])
-        default_label = data.get("default_label")
-        if default_label:
-            for s in servers:
-                if s.get("label") == default_label:
-                    return default_label, s.get("url")
-        if servers:
-            s0 = servers[0]
-            return s0.get("label"), s0.get("url")
+        if i == 0:
+            # The default comes from the first config found only
+            default_label = data.get("default_label")
+            if default_label:
+                for s in servers:
+                    if s.get("label") == default_label:
+                        default = (default_label, s.get("url"))
+                        break
+            if default == (None, None) and servers:
+                default = (servers[0].get("label"), servers[0].get("url"))
+        for s in servers:
+            lbl = s.get("label")
+            url = s.get("url")
+            if lbl and url:
+                servers_map[lbl] = url
+    return default, servers_map, next(iter(servers_map.values()), None)
+
+
+def _invalidate_servers_cache() -> None:
+    """Drop the parsed config; edits are also picked up via mtime on the next call."""
+    _cfg_snapshot.cache_clear()
+
+
+def _resolve_server() -> tuple[str | None, str | None]:
+    """Load default MCP server label/url from docs/mcpServers.json if present."""
+    try:
+        return _cfg_snapshot(_current_mtimes())[0]
     except Exception:
         return (None, None)
-    return (None, None)
 
 
-def _load_servers_map() -> dict[str, str]:
-    """Return {label: url} for all configured servers across common locations."""
-    out: dict[str, str] = {}
+def _servers_snapshot() -> tuple[tuple[str | None, str | None], dict[str, str], str | None]:
+    """The cached snapshot itself; callers must not mutate the map."""
     try:
-        root = Path(__file__).resolve().parent.parent
-        here = Path(__file__).resolve().parent
-        for cfg_path in [here / "mcpServers.json", root / "mcpServers.json", root.parent / "mcpServers.json"]:
-            if not cfg_path.exists():
-                continue
-            try:
-                try:
-                    data = json.loads(cfg_path.read_text(encoding="utf-8"))
-                except Exception:
-                    data = json.loads(cfg_path.read_text(encoding="utf-8-sig"))
-                for s in data.get("servers", []):
-                    lbl = s.get("label")
-                    url = s.get("url")
-                    if lbl and url:
-                        out[lbl] = url
-            except Exception:
-                continue
+        return _cfg_snapshot(_current_mtimes())
     except Exception:
-        pass
-    return out
+        return (None, None), {}, None
 
 
-def execute_envelope_tool(tool: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-    logger.debug("execute_envelope_tool tool=%s args=%s", tool, arguments)
-    if tool == "mcp_search":
-        return mcp_search(**arguments)
-    if tool == "mcp_fetch":
-        return mcp_fetch(**arguments)
-
-    # Handle direct workflow tools
-    if "workflow" in tool:
-        if not (USE_MCP_STDIO or USE_MCP_SSE or USE_DIRECT_MCP):
-            return {"error": "workflow tools require transport"}
-
-        if USE_DIRECT_MCP:
-            # Handle workflow tools directly in DIRECT mode
-            return mcp_client_direct.call_tool(tool, arguments)  # type: ignore[name-defined]
-
-    # Generic tool execution: call any available tool by its name
-    if tool not in {"mcp_call", "mcp_search", "mcp_fetch"}:
-        if USE_MCP_STDIO:
-            return mcp_client_stdio.call_tool(tool, arguments)  # type: ignore[name-defined]
-        if USE_MCP_SSE:
-            # Select a server URL if available
-            servers = _load_servers_map()
-            server_url = next(iter(servers.values())) if servers else None
-            return mcp_client_sse.call_tool(tool, arguments, server_url=server_url)  # type: ignore[name-defined]
-        if USE_DIRECT_MCP:
-            return mcp_client_direct.call_tool(tool, arguments)  # type: ignore[name-defined]
-
-    if tool == "mcp_call":
-        if USE_DIRECT_MCP:
-            # In DIRECT mode, unwrap mcp_call and execute the tool directly
-            tool_name = arguments.get("tool_name") or arguments.get("name")
-            tool_args = arguments.get("arguments") or {}
-            if not tool_name:
-                return {"error": "Missing 'tool_name' or 'name' for mcp_call"}
-            return execute_envelope_tool(tool_name, tool_args)
-        elif not (USE_MCP_STDIO or USE_MCP_SSE):
-            return {"error": "mcp_call requires USE_MCP_STDIO=1 or USE_MCP_SSE=1"}
-        name = arguments.get("name")
-        params = arguments.get("arguments") or {}
-        if not name:
-            return {"error": "Missing 'name' for mcp_call"}
-        # High-risk gating
-        DANGEROUS = {"execute_powershell", "powershell", "shell", "bash", "python", "python_eval", "delete_item", "write_block", "change_directory"}
-        if name in DANGEROUS and not params.get("approved"):
-            return {"approval_required": True, "reason": f"High-risk MCP tool '{name}' requires human approval"}
-        # Server selection
-        server_url = arguments.get("server_url")
-        server_label = arguments.get("server_label")
-        servers = _load_servers_map()
-        if not server_url:
-            if server_label:
-                server_url = servers.get(server_label)
-                if not server_url:
-                    return {"error": f"Unknown server_label '{server_label}'"}
-            else:
-                if len(servers) > 1:
-                    return {"error": "Multiple MCP servers configured; provide 'server_label' in arguments"}
-                if len(servers) == 1:
-                    server_url = next(iter(servers.values()))
-        logger.debug("mcp_call name=%s via %s url=%s", name, "STDIO" if USE_MCP_STDIO else "SSE", server_url)
-        if USE_MCP_STDIO:
-            return mcp_client_stdio.call_tool(name, params)  # type: ignore[name-defined]
+# Per-tool flag bits for mcp_call; unknown tools have no flags
+_REQUIRES_APPROVAL = 1  # needs explicit human approval ("approved": true) before running
+_TOOL_FLAGS: Dict[str, int] = dict.fromkeys((
+    "execute_powershell", "powershell", "shell", "bash", "python", "python_eval",
+    "delete_item", "write_block", "change_directory",
+), _REQUIRES_APPROVAL)
+_APPROVAL_RESPONSE: Dict[str, Any] = {"approval_required": True}
+
+
+def execute_envelope_tools(calls: list[tuple[str, Dict[str, Any]]]) -> list[Dict[str, Any]]:
+    """Execute several envelope tool calls; results keep the order of calls.
+
+    Plain named tools go out concurrently over the persistent STDIO/SSE session.
+    Anything that needs envelope handling (mcp_search/mcp_fetch/mcp_call, workflow
+    routing) runs through execute_envelope_tool one by one.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("execute_envelope_tools count=%d", len(calls))
+    direct = (USE_MCP_STDIO or USE_MCP_SSE) and len(calls) > 1 and not any(
+        tool in _BUILTIN_TOOLS for tool, _ in calls
+    )
+    if not direct:
+        return [execute_envelope_tool(tool, args) for tool, args in calls]
+    if USE_MCP_STDIO:
+        return _get_client().call_tools(calls)
+    return _get_client().call_tools(calls, server_url=_default_server_url())
+
+
+def _mcp_call_direct(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    # In DIRECT mode, unwrap mcp_call and execute the tool directly
+    tool_name = arguments.get("tool_name") or arguments.get("name")
+    tool_args = arguments.get("arguments") or {}
+    if not tool_name:
+        return {"error": "Missing 'tool_name' or 'name' for mcp_call"}
+    tool_name = sys.intern(tool_name)
+    handler = _HANDLERS.get(tool_name)
+    if handler is None:
+        # Plain server tool: straight to the direct client, no second dispatch
+        return _CALL(tool_name, tool_args)
+    return handler(tool_args)
+
+
+def _mcp_call_unsupported(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {"error": "mcp_call requires USE_MCP_STDIO=1 or USE_MCP_SSE=1"}
+
+
+def _mcp_call_session(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    name = arguments.get("name")
+    params = arguments.get("arguments") or {}
+    if not name:
+        return {"error": "Missing 'name' for mcp_call"}
+    name = sys.intern(name)
+    # High-risk gating
+    if _TOOL_FLAGS.get(name, 0) & _REQUIRES_APPROVAL and not params.get("approved"):
+        return {**_APPROVAL_RESPONSE, "reason": f"High-risk MCP tool '{name}' requires human approval"}
+    # Server selection
+    server_url = arguments.get("server_url")
+    server_label = arguments.get("server_label")
+    if not server_url:
+        _, servers, first_url = _servers_snapshot()
+        if server_label:
+            server_url = servers.get(server_label)
+            if not server_url:
+                return {"error": f"Unknown server_label '{server_label}'"}
         else:
-            return mcp_client_sse.call_tool(name, params, server_url=server_url)  # type: ignore[name-defined]
+            if len(servers) > 1:
+                return {"error": "Multiple MCP servers configured; provide 'server_label' in arguments"}
+            server_url = first_url
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("mcp_call name=%s via %s url=%s", name, _TRANSPORT, server_url)
+    return _SESSION_CALL(name, params, server_url)
+
+
+# The stdio client talks to its single spawned server; only SSE routes by URL
+_SESSION_CALL = {
+    "STDIO": lambda name, params, server_url: _get_client().call_tool(name, params),
+    "SSE": lambda name, params, server_url: _get_client().call_tool(name, params, server_url=server_url),
+}.get(_TRANSPORT)
+
+_handle_mcp_call: Callable[[Dict[str, Any]], Dict[str, Any]] = {
+    "OPENAI_MCP": _mcp_call_unsupported,
+    "DIRECT": _mcp_call_direct,
+    "STDIO": _mcp_call_session,
+    "SSE": _mcp_call_session,
+}[_TRANSPORT]
+
+
+def execute_envelope_tool(tool: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("execute_envelope_tool tool=%s args=%s", tool, arguments)
+    # Names parsed from JSON are fresh strings; interned ones hit the dict by identity
+    tool = sys.intern(tool)
+    handler = _HANDLERS.get(tool)
+    if handler is not None:
+        return handler(arguments)
+    # Generic tool execution: call any available tool by its name. Workflow tools
+    # need no special case; mcp_client_direct.call_tool routes start_*_workflow itself.
+    if _CALL is not None:
+        return _CALL(tool, arguments)
     # Unknown tool: echo back for debugging
     return {"error": f"unknown tool: {tool}", "args": arguments}
+
+
+# Envelope-level tools handled here rather than forwarded to the server by name
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "mcp_search": lambda arguments: mcp_search(**arguments),
+    "mcp_fetch": lambda arguments: mcp_fetch(**arguments),
+    "mcp_call": _handle_mcp_call,
+}
+_BUILTIN_TOOLS: frozenset[str] = frozenset(_HANDLERS)
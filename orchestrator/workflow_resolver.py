@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Any
 class WorkflowResolver:
     """Resolves intents to workflow templates and creates appropriate envelopes"""
 
+    __slots__ = ("template_mapping",)
+
     def __init__(self):
         # Template ID mapping for compatibility with MCP server
         self.template_mapping = {
@@ -72,7 +74,7 @@ class WorkflowResolver:
         Returns:
             Envelope dictionary or None if intent cannot be resolved
         """
-        template_id = self.resolve_intent_to_template(intent_name)
-        if template_id:
-            return self.create_workflow_envelope(template_id, intent_name, confidence)
-        return None
\ No newline at end of file
+        template_id = self.template_mapping.get(intent_name)
+        if not template_id:
+            return None
+        return self.create_workflow_envelope(template_id, intent_name, confidence)
@@ -8,8 +8,9 @@ import sys
 from pathlib import Path
 
 # Add orchestrator to path
-sys.path.insert(0, str(Path(__file__).parent))
-sys.path.insert(0, str(Path(__file__).parent / "orchestrator"))
+if str(Path(__file__).parent / "orchestrator") not in sys.path:  # conftest.py already did this under pytest
+    sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, str(Path(__file__).parent / "orchestrator"))
 
 # Set Anthropic API key
 os.environ['ANTHROPIC_API_KEY'] = 'your-api-key-here'  # Replace with actual key
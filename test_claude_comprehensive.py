@@ -9,8 +9,9 @@ import json
 from pathlib import Path
 
 # Add current directory to path
-sys.path.insert(0, str(Path(__file__).parent))
-sys.path.insert(0, str(Path(__file__).parent / "orchestrator"))
+if str(Path(__file__).parent / "orchestrator") not in sys.path:  # conftest.py already did this under pytest
+    sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, str(Path(__file__).parent / "orchestrator"))
 
 def test_claude_comprehensive():
     """Comprehensive test of Claude integration"""
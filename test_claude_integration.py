@@ -8,8 +8,9 @@ import sys
 from pathlib import Path
 
 # Add current directory to path
-sys.path.insert(0, str(Path(__file__).parent))
-sys.path.insert(0, str(Path(__file__).parent / "orchestrator"))
+if str(Path(__file__).parent / "orchestrator") not in sys.path:  # conftest.py already did this under pytest
+    sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, str(Path(__file__).parent / "orchestrator"))
 
 def test_claude_integration():
     """Test that Claude models can be used with the orchestrator"""
@@ -7,7 +7,8 @@ import sys
 import os
 
 # Add orchestrator to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'orchestrator'))
+if os.path.join(os.path.dirname(__file__), 'orchestrator') not in sys.path:  # conftest.py already did this under pytest
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'orchestrator'))
 
 from combined_mcp_server import workflow_templates
 